@@ -48,18 +48,46 @@ unconfortable with this extrapolation, he/she can import the old version:
 
 """
 
+import collections
+import collections.abc
+import functools
+import inspect
+import mmap
 import os
 
-import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import warnings
 
-from astropy.table import Table, vstack
+from astropy.table import Table
 from scipy.interpolate import CloughTocher2DInterpolator, LinearNDInterpolator
-from scipy.interpolate import griddata, interp1d
+from scipy.interpolate import RegularGridInterpolator, interp1d
+from scipy.spatial import Delaunay
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
 
 dirpath = os.path.dirname(__file__)
 
+
+def _env_int(name, default):
+    # an integer setting from the environment, the default if it is not set
+    # or not an integer
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        warnings.warn('Ignoring the environment variable ' + name +
+                      ', which is not an integer.')
+        return default
+
 #-------------------------------------------------------------------------------
 #
 #   Define the functions that will be used for reading cooling tracks and
@@ -67,6 +95,109 @@ dirpath = os.path.dirname(__file__)
 #
 #-------------------------------------------------------------------------------
 
+# passband names used in this module --> column names of the Montreal tables
+_BAND_TO_COL = {
+    'bp': 'G_BP', 'rp': 'G_RP', 'G': 'G',  # Gaia
+    'Su': 'Su', 'Sg': 'Sg', 'Sr': 'Sr', 'Si': 'Si', 'Sz': 'Sz',  # SDSS
+    'Pg': 'Pg', 'Pr': 'Pr', 'Pi': 'Pi', 'Pz': 'Pz', 'Py': 'Py',  # PanSTARRS
+    'U': 'U', 'B': 'B', 'V': 'V', 'R': 'R', 'I': 'I',  # Johnson
+    'J': 'J', 'H': 'H', 'Ks': 'Ks',  # 2MASS
+    'MY': 'MY', 'MJ': 'MJ', 'MH': 'MH', 'MK': 'MK',  # Mauna Kea Observatory
+    'W1': 'W1', 'W2': 'W2', 'W3': 'W3', 'W4': 'W4',  # WISE
+    'S36': 'S3.6', 'S45': 'S4.5', 'S58': 'S5.8', 'S80': 'S8.0',  # Spitzer
+    'FUV': 'FUV', 'NUV': 'NUV',  # GALEX
+    'Mbol': 'Mbol',  # bolometric magnitude
+}
+
+# the piecewise-linear IFMRs are built once at import, out-of-range values are
+# filled afterwards in IFMR so that the same interpolant serves all fill_value
+_CUMMINGS18_KNOTS = ((0.19, 0.4, 0.50, 0.72, 0.87, 1.25, 1.4),
+                     (0.23, 0.5, 0.95, 2.8, 3.65, 8.2, 10))
+_CUMMINGS18_EXTRAP = interp1d(*_CUMMINGS18_KNOTS,
+                              fill_value='extrapolate',
+                              bounds_error=False)
+_ELBADRY18_KNOTS = ((0.5, 0.67, 0.81, 0.91, 1.37),
+                    (0.95, 2.75, 3.54, 5.21, 8.))
+_ELBADRY18_EXTRAP = interp1d(*_ELBADRY18_KNOTS,
+                             fill_value='extrapolate',
+                             bounds_error=False)
+
+
+# linear IFMRs: (minimum m_WD, maximum m_WD, a, b, two-part), where
+# m_MS = (m_WD - a) / b, and for the two-part relations (m_WD_break, a, b) gives
+# the relation used above the break point
+_IFMR_LINEAR = {
+    # Catalan et al. 2008 [m_i = 1.5-6.4]
+    'Catalan08': (0.5741, 1.1195, 0.384, 0.117, None),
+    # Catalan et al. 2008 (two-part) [m_i = 1.5-6.4] break point at 2.707 solar
+    # mass
+    'Catalan08b': (0.573, 1.1948, 0.429, 0.096, (0.68890243, 0.318, 0.137)),
+    # Salaris et al. 2009 [m_i = 1.7-8.5]
+    'Salaris09': (0.6088, 1.18, 0.466, 0.084, None),
+    # Salaris et al. 2009 (two-part) [m_i = 1.7-8.5] breakpoint at 4.0 solar
+    # mass
+    'Salaris09b': (0.5588, 1.0785, 0.331, 0.134, (0.867, 0.679, 0.047)),
+    # Williams, Bolte & Koester (2009) [m_i = 1.25-8.0]
+    'Williams09': (0.50025, 1.371, 0.339, 0.129, None),
+    # Kalirai et al. (2009) [m_f = 1.1-6.5]
+    'Kalirai09': (0.5741, 1.1195, 0.428, 0.109, None),
+    # Kalirai et al. (2009) (including M4) [m_i = 1.1-6.5]
+    'Kalirai09b': (0.5741, 1.1195, 0.463, 0.101, None),
+}
+
+
+# set the environment variable WD_MODELS_WARN=0 to silence the IFMR warnings,
+# e.g. in batch processing
+_WARN_ENABLED = os.environ.get('WD_MODELS_WARN', '1') != '0'
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_once(message):
+    # warnings.warn inspects the stack on every call, each message is only
+    # issued once per session. The warning points at the first caller outside
+    # of this module, however deep the call into it is.
+    stacklevel = 1
+    frame = inspect.currentframe()
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+        stacklevel += 1
+    warnings.warn(message, stacklevel=stacklevel)
+
+
+def _warn_outside_grid(below, above):
+    # below and above are the masks of m_WD outside of the IFMR grid
+    if not _WARN_ENABLED:
+        return
+    if below.any():
+        _warn_once('WD mass is below the minimum grid mass, the MS mass is '
+                   'found by extrapolation.')
+    if above.any():
+        _warn_once('WD mass is above the maximum grid mass, the MS mass is '
+                   'found by extrapolation.')
+
+
+@functools.lru_cache(maxsize=16)
+def _manual_ifmr_interp(m_f, m_i):
+    # the interpolant of a manual IFMR, keyed by the values of the grid rather
+    # than the identity of the arrays, so that a grid modified in place is not
+    # served a stale interpolant
+    return interp1d(m_f, m_i, fill_value='extrapolate', bounds_error=False)
+
+
+def _parse_fill_value(fill_value):
+    # the (low, high) fill values of the IFMR, None to extrapolate
+    if isinstance(fill_value, (list, tuple)):
+        if len(fill_value) != 2:
+            raise ValueError('list has to of size 2.')
+        return fill_value[0], fill_value[1]
+    elif fill_value == 'extrapolate':
+        return None
+    elif np.isfinite(fill_value):
+        return fill_value, fill_value
+    else:
+        raise ValueError('fill_value has to be numeric, \'extrapolate\' or '
+                         'list of size 2.')
+
 
 def IFMR(m_WD, model='Cummings18', fill_value=0, mass=None):
     '''
@@ -88,7 +219,7 @@ def IFMR(m_WD, model='Cummings18', fill_value=0, mass=None):
                 8. Cummings et al. 2018
                 9. El-Badry et al. 2018
                 10. Manual
-        fill_value: numeric, str or list of size 2 (Default: 0)
+        fill_value: numeric, str or list or tuple of size 2 (Default: 0)
             Value to fill if m_WD is outside the interpolated grid. Set to
             'extrapolate' to return the extrapolated values.
         mass: list or array of 2 lists or arrays
@@ -103,196 +234,138 @@ def IFMR(m_WD, model='Cummings18', fill_value=0, mass=None):
 
     m_WD = np.asarray(m_WD).reshape(-1)
 
-    if isinstance(fill_value, list):
-        if len(fill_value) != 2:
-            raise ValueError('list has to of size 2.')
-        fill_value_low = fill_value[0]
-        fill_value_high = fill_value[1]
-    elif np.isfinite(fill_value):
-        fill_value_low = fill_value
-        fill_value_high = fill_value
-    elif fill_value == 'extrapolate':
-        pass
-    else:
-        raise ValueError('fill_value has to be numeric, \'extrapolate\' or '
-                         'list of size 2.')
+    fill_values = _parse_fill_value(fill_value)
 
-    # Catalan et al. 2008 [m_i = 1.5-6.4]
-    if model == 'Catalan08':
-        if (m_WD < 0.5741).any():
-            warnings.warn('WD mass is below the minimum grid mass, the '
-                          'MS mass is found by extrapolation.')
-        if (m_WD > 1.1195).any():
-            warnings.warn('WD mass is above the maximum grid mass, the '
-                          'MS mass is found by extrapolation.')
-
-        m_MS = (m_WD - 0.384) / 0.117
-
-        if fill_value != 'extrapolate':
-            m_MS[m_WD < 0.5741] = fill_value_low
-            m_MS[m_WD > 1.1195] = fill_value_high
-
-    # Catalan et al. 2008 (two-part) [m_i = 1.5-6.4] break point at 2.707 solar mass
-    elif model == 'Catalan08b':
-        if (m_WD < 0.573).any():
-            warnings.warn('WD mass is below the minimum grid mass, the '
-                          'MS mass is found by extrapolation.')
-        if (m_WD > 1.1948).any():
-            warnings.warn('WD mass is above the maximum grid mass, the '
-                          'MS mass is found by extrapolation.')
-
-        mask = (m_WD >= 0.68890243)
-        m_MS = (m_WD - 0.429) / 0.096
-        m_MS[mask] = (m_WD[mask] - 0.318) / 0.137
-
-        if fill_value != 'extrapolate':
-            m_MS[m_WD < 0.573] = fill_value_low
-            m_MS[m_WD > 1.1948] = fill_value_high
-
-    # Salaris et al. 2009 [m_i = 1.7-8.5]
-    elif model == 'Salaris09':
-        if (m_WD < 0.6088).any():
-            warnings.warn('WD mass is below the minimum grid mass, the '
-                          'MS mass is found by extrapolation.')
-        if (m_WD > 1.18).any():
-            warnings.warn('WD mass is above the maximum grid mass, the '
-                          'MS mass is found by extrapolation.')
-
-        m_MS = (m_WD - 0.466) / 0.084
-
-        if fill_value != 'extrapolate':
-            m_MS[m_WD < 0.6088] = fill_value_low
-            m_MS[m_WD > 1.18] = fill_value_high
-
-    # Salaris et al. 2009 (two-part) [m_i = 1.7-8.5] breakpoint at 4.0 solar mass
-    elif model == 'Salaris09b':
-        if (m_WD < 0.5588).any():
-            warnings.warn('WD mass is below the minimum grid mass, the '
-                          'MS mass is found by extrapolation.')
-        if (m_WD > 1.0785).any():
-            warnings.warn('WD mass is above the maximum grid mass, the '
-                          'MS mass is found by extrapolation.')
-
-        mask = m_WD >= 0.867
-        m_MS = (m_WD - 0.331) / 0.134
-        m_MS[mask] = (m_WD[mask] - 0.679) / 0.047
-
-        if fill_value != 'extrapolate':
-            m_MS[m_WD < 0.5588] = fill_value_low
-            m_MS[m_WD > 1.0785] = fill_value_high
-
-    # Williams, Bolte & Koester (2009) [m_i = 1.25-8.0]
-    elif model == 'Williams09':
-        if (m_WD < 0.50025).any():
-            warnings.warn('WD mass is below the minimum grid mass, the '
-                          'MS mass is found by extrapolation.')
-        if (m_WD > 1.371).any():
-            warnings.warn('WD mass is above the maximum grid mass, the '
-                          'MS mass is found by extrapolation.')
-
-        m_MS = (m_WD - 0.339) / 0.129
-
-        if fill_value != 'extrapolate':
-            m_MS[m_WD < 0.50025] = fill_value_low
-            m_MS[m_WD > 1.371] = fill_value_high
-
-    # Kalirai et al. (2009) [m_f = 1.1-6.5]
-    elif model == 'Kalirai09':
-        if (m_WD < 0.5741).any():
-            warnings.warn('WD mass is below the minimum grid mass, the '
-                          'MS mass is found by extrapolation.')
-        if (m_WD > 1.1195).any():
-            warnings.warn('WD mass is above the maximum grid mass, the '
-                          'MS mass is found by extrapolation.')
-
-        m_MS = (m_WD - 0.428) / 0.109
-
-        if fill_value != 'extrapolate':
-            m_MS[m_WD < 0.5741] = fill_value_low
-            m_MS[m_WD > 1.1195] = fill_value_high
-
-    # Kalirai et al. (2009) (including M4) [m_i = 1.1-6.5]
-    elif model == 'Kalirai09b':
-        if (m_WD < 0.5741).any():
-            warnings.warn(
-                'One or more WD mass is below the minimum grid mass, '
-                'the MS mass is found by extrapolation.')
-        if (m_WD > 1.1195).any():
-            warnings.warn(
-                'One or more WD mass is above the maximum grid mass, '
-                'the MS mass is found by extrapolation.')
-
-        m_MS = (m_WD - 0.463) / 0.101
-
-        if fill_value != 'extrapolate':
-            m_MS[m_WD < 0.5741] = fill_value_low
-            m_MS[m_WD > 1.1195] = fill_value_high
+    # linear relations, m_MS = (m_WD - a) / b
+    if model in _IFMR_LINEAR:
+        m_WD_min, m_WD_max, a, b, two_part = _IFMR_LINEAR[model]
+        m_MS = (m_WD - a) / b
+        if two_part is not None:
+            m_WD_break, a, b = two_part
+            m_MS = np.where(m_WD >= m_WD_break, (m_WD - a) / b, m_MS)
 
     # Cummings et al. (2018)
     elif model == 'Cummings18':
-        if (m_WD < 0.19).any():
-            warnings.warn('WD mass is below the minimum grid mass, the MS '
-                          'mass is found by extrapolation.')
-        if (m_WD > 1.4).any():
-            warnings.warn('WD mass is above the maximum grid mass, the MS '
-                          'mass is found by extrapolation.')
-
-        if fill_value == 'extrapolate':
-            m_MS = interp1d((0.19, 0.4, 0.50, 0.72, 0.87, 1.25, 1.4),
-                            (0.23, 0.5, 0.95, 2.8, 3.65, 8.2, 10),
-                            fill_value='extrapolate',
-                            bounds_error=False)(m_WD)
-        else:
-            m_MS = interp1d((0.19, 0.4, 0.50, 0.72, 0.87, 1.25, 1.4),
-                            (0.23, 0.5, 0.95, 2.8, 3.65, 8.2, 10),
-                            fill_value=[fill_value_low, fill_value_high],
-                            bounds_error=False)(m_WD)
+        m_WD_min, m_WD_max = _CUMMINGS18_KNOTS[0][0], _CUMMINGS18_KNOTS[0][-1]
+        m_MS = _CUMMINGS18_EXTRAP(m_WD)
 
     # El-Badry et al. (2018) [m_i = 0.95 - 8.]
     elif model == 'ElBadry18':
-        if (m_WD < 0.5).any():
-            warnings.warn('WD mass is below the minimum grid mass, the MS '
-                          'mass is found by extrapolation.')
-        if (m_WD > 1.37).any():
-            warnings.warn('WD mass is above the maximum grid mass, the MS '
-                          'mass is found by extrapolation.')
-
-        if fill_value == 'extrapolate':
-            m_MS = interp1d((0.5, 0.67, 0.81, 0.91, 1.37),
-                            (0.95, 2.75, 3.54, 5.21, 8.),
-                            fill_value='extrapolate',
-                            bounds_error=False)(m_WD)
-
-        else:
-            m_MS = interp1d((0.5, 0.67, 0.81, 0.91, 1.37),
-                            (0.95, 2.75, 3.54, 5.21, 8.),
-                            fill_value=[fill_value_low, fill_value_high],
-                            bounds_error=False)(m_WD)
+        m_WD_min, m_WD_max = _ELBADRY18_KNOTS[0][0], _ELBADRY18_KNOTS[0][-1]
+        m_MS = _ELBADRY18_EXTRAP(m_WD)
 
     # Manual input
     elif model == 'manual':
         m_i = mass[0]
         m_f = mass[1]
-        if fill_value == 'extrapolate':
-            m_MS = interp1d(m_f,
-                            m_i,
-                            fill_value='extrapolate',
-                            bounds_error=False)(m_WD)
-        else:
-            m_MS = interp1d(m_f,
-                            m_i,
-                            fill_value=[fill_value_low, fill_value_high],
-                            bounds_error=False)(m_WD)
+        m_WD_min, m_WD_max = np.min(m_f), np.max(m_f)
+
+        m_MS = _manual_ifmr_interp(tuple(np.asarray(m_f, dtype=float)),
+                                   tuple(np.asarray(m_i, dtype=float)))(m_WD)
 
     else:
         raise ValueError('Please choose from a valid IFMR model.')
 
+    # the masks are shared by the warnings and the fill
+    below = m_WD < m_WD_min
+    above = m_WD > m_WD_max
+    if model != 'manual':
+        _warn_outside_grid(below, above)
+
+    if fill_values is not None:
+        fill_value_low, fill_value_high = fill_values
+        m_MS = np.where(below, fill_value_low,
+                        np.where(above, fill_value_high, m_MS))
+
     # enforce m_MS is at least as large as m_WD
-    m_MS[m_MS < m_WD] = m_WD[[m_MS < m_WD]]
+    m_MS = np.maximum(m_MS, m_WD)
 
     return m_MS
 
 
+if njit is not None:
+
+    # fastmath without the finite-math flags, so that a NaN or inf fill value
+    # of the IFMR propagates as in numpy
+    _FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+    @njit(parallel=True, fastmath=_FASTMATH, cache=True)
+    def _choi16_life(mi):
+        # Choi et al. 2016 MS lifetime, one pass over the progenitor masses
+        life0 = np.empty_like(mi)
+        for i in prange(mi.size):
+            m = mi[i]
+            if m > 2.11:
+                p = 10.75941 + m * (-1.043523 + m * (0.1366088 +
+                                                     m * -7.110290e-3))
+            else:
+                p = 13.37807 + m * (-6.292517 + m * (4.451837 + m *
+                                                     (-1.773315 +
+                                                      m * 0.2944963)))
+            life0[i] = 10.0**p
+        return life0
+
+    @njit(parallel=True, fastmath=_FASTMATH, cache=True)
+    def _linear_ifmr_choi16_life(m_WD, a, b, m_WD_break, a2, b2, fill,
+                                 m_WD_min, m_WD_max, fill_value_low,
+                                 fill_value_high):
+        # a linear IFMR followed by the Choi et al. 2016 MS lifetime in one
+        # pass, without the intermediate arrays of IFMR and _choi16_life
+        life0 = np.empty_like(m_WD)
+        for i in prange(m_WD.size):
+            m = m_WD[i]
+            if fill and m < m_WD_min:
+                mi = fill_value_low
+            elif fill and m > m_WD_max:
+                mi = fill_value_high
+            elif m >= m_WD_break:
+                mi = (m - a2) / b2
+            else:
+                mi = (m - a) / b
+            # enforce m_MS is at least as large as m_WD
+            if mi < m:
+                mi = m
+            if mi > 2.11:
+                p = 10.75941 + mi * (-1.043523 + mi * (0.1366088 +
+                                                       mi * -7.110290e-3))
+            else:
+                p = 13.37807 + mi * (-6.292517 + mi * (4.451837 + mi *
+                                                       (-1.773315 +
+                                                        mi * 0.2944963)))
+            life0[i] = 10.0**p
+        return life0
+
+else:
+
+    def _choi16_life(mi):
+        # numba is not available, evaluate the polynomials in Horner form with
+        # np.polyval instead
+        life0 = 10**np.polyval(
+            [0.2944963, -1.773315, 4.451837, -6.292517, 13.37807], mi)
+        high = mi > 2.11
+        life0[high] = 10**np.polyval(
+            [-7.110290e-3, 0.1366088, -1.043523, 10.75941], mi[high])
+        return life0
+
+
+def _linear_ifmr_choi16(m_WD, ifmr_model, ifmr_fill_value):
+    # the Choi16 MS lifetime of a linear IFMR through the fused numba kernel
+    m_WD_flat = np.ascontiguousarray(m_WD, dtype=float).reshape(-1)
+    fill_values = _parse_fill_value(ifmr_fill_value)
+    m_WD_min, m_WD_max, a, b, two_part = _IFMR_LINEAR[ifmr_model]
+    _warn_outside_grid(m_WD_flat < m_WD_min, m_WD_flat > m_WD_max)
+    if two_part is None:
+        two_part = (np.inf, a, b)
+    fill = fill_values is not None
+    if not fill:
+        fill_values = (np.nan, np.nan)
+    life0 = _linear_ifmr_choi16_life(m_WD_flat, a, b, *two_part, fill,
+                                     m_WD_min, m_WD_max,
+                                     float(fill_values[0]),
+                                     float(fill_values[1]))
+    return np.reshape(life0, np.shape(m_WD))
+
+
 def MS_age(m_WD,
            model='Choi16',
            coeff=None,
@@ -332,18 +405,18 @@ def MS_age(m_WD,
         #        result = ( 10**9.38 * IFMR(m_WD, model, fill_value)**-2.16 ) * (IFMR(m_WD, model, fill_value) >= 2.3) + \
         #            ( 10**10 * IFMR(m_WD, model, fill_value)**-3.5 ) * (IFMR(m_WD, model, fill_value) < 2.3)
         # we update this pre-WD lifetime estimate on Oct 6, 2019.
+        if (njit is not None and model == 'Choi16'
+                and ifmr_model in _IFMR_LINEAR):
+            # fused numba kernel for the linear IFMRs
+            return _linear_ifmr_choi16(m_WD, ifmr_model, ifmr_fill_value)
+
         mi = IFMR(m_WD,
                   model=ifmr_model,
                   fill_value=ifmr_fill_value,
                   mass=ifmr_mass)
 
         if model == 'Choi16':
-            life0 = 10**(13.37807 - 6.292517 * mi + 4.451837 * mi**2 -
-                         1.773315 * mi**3 + 0.2944963 * mi**4)
-            if (mi > 2.11).any():
-                life0[mi > 2.11] = 10**(10.75941 - 1.043523 * mi[mi > 2.11] +
-                                        0.1366088 * mi[mi > 2.11]**2 -
-                                        7.110290e-3 * mi[mi > 2.11]**3)
+            life0 = _choi16_life(np.ascontiguousarray(mi, dtype=float))
 
         elif model == 'manual_poly':
 
@@ -356,10 +429,63 @@ def MS_age(m_WD,
         else:
             raise ValueError('Please choose from a valid MS model.')
 
-    return life0
-
-
-MS_age = np.vectorize(MS_age)
+    # IFMR works on a flattened copy, restore the shape of the input
+    return np.reshape(life0, np.shape(m_WD))
+
+
+# masses of the Montreal Table_Mass files
+_MONTREAL_MASSES = [
+    '0.2', '0.3', '0.4', '0.5', '0.6', '0.7', '0.8', '0.9', '1.0', '1.2'
+]
+_MONTREAL_MASS_VALUES = np.array(_MONTREAL_MASSES, dtype=float)
+
+# columns of the Montreal atmosphere tables that have been read, keyed by the
+# file name in Montreal_atm_grid_2019/
+_ATM_TABLE_CACHE = {}
+
+
+def _read_ascii(path, format, fast_reader=True, **kwargs):
+    # reading with an explicit format skips the format guessing of
+    # Table.read(format='ascii'), which tries many readers in turn. A file
+    # that does not follow the format is read with guessing instead.
+    try:
+        return Table.read(path,
+                          format=format,
+                          guess=False,
+                          fast_reader=fast_reader,
+                          **kwargs)
+    except ValueError:
+        return Table.read(path, format='ascii', **kwargs)
+
+
+def _read_numeric_table(path, step=1):
+    # read a whitespace separated table of numbers, whose column names are
+    # given by the first line that is not a comment, into a structured array.
+    # np.loadtxt skips the format guessing, type inference and masking of
+    # astropy Table, which dominate the reading time of these files. Only
+    # every step-th row is parsed, the same as reading all and slicing.
+    with open(path) as table_file:
+        lines = table_file.readlines()
+    for header, line in enumerate(lines):
+        if line.strip() and not line.lstrip().startswith('#'):
+            break
+    return np.loadtxt(lines[header + 1::step],
+                      dtype=[(name, float) for name in line.split()],
+                      ndmin=1)
+
+
+def _load_atm_table(name):
+    # parsing the ascii tables is slow, so each file is only read once and its
+    # columns are kept as arrays. The arrays are shared and must not be
+    # modified in place.
+    if name not in _ATM_TABLE_CACHE:
+        table = _read_numeric_table(dirpath + '/Montreal_atm_grid_2019/' +
+                                    name)
+        _ATM_TABLE_CACHE[name] = {
+            column: np.ascontiguousarray(table[column])
+            for column in table.dtype.names
+        }
+    return _ATM_TABLE_CACHE[name]
 
 
 def interpolate_2d(x, y, z, method):
@@ -371,10 +497,86 @@ def interpolate_2d(x, y, z, method):
     #return interp2d(x, y, z, kind=method)
 
 
+def _triangulate_2d(x, y):
+    # Delaunay triangulation of the points, rescaled as scipy does with
+    # rescale=True, so that one triangulation can be shared by the
+    # interpolators of several quantities on the same points
+    points = np.ascontiguousarray(np.array((x, y), dtype=float).T)
+    offset = np.mean(points, axis=0)
+    scale = np.ptp(points, axis=0)
+    scale[~(scale > 0)] = 1.0
+    return Delaunay((points - offset) / scale), offset, scale
+
+
+def _split_xi(xi):
+    # the x and y of a mapping called as f(x, y) or f((x, y)), like the scipy
+    # interpolators
+    if len(xi) == 1:
+        xi = xi[0]
+    if isinstance(xi, tuple):
+        return xi
+    xi = np.asarray(xi)
+    if xi.ndim == 1:
+        # a single point is a (1, 2) array, as in scipy
+        xi = xi.reshape(-1, 2)
+    return xi[..., 0], xi[..., 1]
+
+
+class _TriangulationMapping:
+    # the (x, y) --> z mapping of an interpolator on rescaled points, called
+    # on the unscaled x and y. A module-level class rather than a closure, so
+    # that the mappings of a model can be pickled.
+
+    def __init__(self, interpolator, offset, scale):
+        self.interpolator = interpolator
+        self.offset = offset
+        self.scale = scale
+
+    # the data of the scipy interpolator, as on the mappings of interpolate_2d
+    @property
+    def tri(self):
+        return self.interpolator.tri
+
+    @property
+    def points(self):
+        return self.interpolator.points
+
+    @property
+    def values(self):
+        return self.interpolator.values
+
+    def __call__(self, *xi):
+        x, y = _split_xi(xi)
+        return self.interpolator(
+            (np.asarray(x) - self.offset[0]) / self.scale[0],
+            (np.asarray(y) - self.offset[1]) / self.scale[1])
+
+
+def _interpolate_on_triangulation(triangulation, z, method):
+    # the same mapping as interpolate_2d, built on a shared triangulation
+    tri, offset, scale = triangulation
+    if method == 'linear':
+        interpolator = LinearNDInterpolator(tri, z)
+    elif method == 'cubic':
+        interpolator = CloughTocher2DInterpolator(tri, z)
+    return _TriangulationMapping(interpolator, offset, scale)
+
+
+class _RegularGridMapping:
+    # a RegularGridInterpolator called as f(x, y) like the other mappings
+
+    def __init__(self, interpolator):
+        self.interpolator = interpolator
+
+    def __call__(self, x, y):
+        return self.interpolator((x, y))
+
+
 def interp_atm(atm_type,
                color,
                logteff_logg_grid=(3.5, 5.1, 0.01, 6.5, 9.6, 0.01),
-               interp_type_atm='linear'):
+               interp_type_atm='linear',
+               regular_grid_atm=False):
     """interpolate the mapping (logteff, logg) --> photometry
 
     This function interpolates the mapping (logteff, logg) --> color index or
@@ -401,6 +603,11 @@ def interp_atm(atm_type,
             corresponding to the grid of logTeff and logg.
         interp_type_atm:    String. {'linear', 'cubic'}. *Optional*
             Linear is much better for our purpose.
+        regular_grid_atm:   Bool. *Optional*
+            If true, only the table on the rectangular (Teff, logg) grid is
+            interpolated, with scipy's RegularGridInterpolator. This is much
+            faster as no triangulation is needed, but the tables for each
+            mass are not used, so the photometry below logg = 7 is NaN.
 
     Returns:
         grid_atm:           2d-array. 
@@ -409,184 +616,357 @@ def interp_atm(atm_type,
                             The interpolated mapping function:
                                 (logteff, logg) --> photometry
 
+    The results are cached, so repeated calls with the same arguments return
+    the same grid_atm and atm_func objects, also between load_model and
+    read_crystallization_fraction. Copy grid_atm before modifying it.
+    interp_atm.cache_clear() drops the cached results.
+
     """
-    logteff = np.zeros(0)  # atmospheric parameter
-    logg = np.zeros(0)  # atmospheric parameter
-    Mbol = np.zeros(0)  # Bolometric
-    bp_Mag = np.zeros(0)  # Gaia
-    rp_Mag = np.zeros(0)  # Gaia
-    G_Mag = np.zeros(0)  # Gaia
-    Su_Mag = np.zeros(0)  # SDSS
-    Sg_Mag = np.zeros(0)  # SDSS
-    Sr_Mag = np.zeros(0)  # SDSS
-    Si_Mag = np.zeros(0)  # SDSS
-    Sz_Mag = np.zeros(0)  # SDSS
-    Pg_Mag = np.zeros(0)  # PanSTARRS
-    Pr_Mag = np.zeros(0)  # PanSTARRS
-    Pi_Mag = np.zeros(0)  # PanSTARRS
-    Pz_Mag = np.zeros(0)  # PanSTARRS
-    Py_Mag = np.zeros(0)  # PanSTARRS
-    U_Mag = np.zeros(0)  # Johnson
-    B_Mag = np.zeros(0)  # Johnson
-    V_Mag = np.zeros(0)  # Johnson
-    R_Mag = np.zeros(0)  # Johnson
-    I_Mag = np.zeros(0)  # Johnson
-    J_Mag = np.zeros(0)  # 2MASS
-    H_Mag = np.zeros(0)  # 2MASS
-    Ks_Mag = np.zeros(0)  # 2MASS
-    MY_Mag = np.zeros(0)  # Mauna Kea Observatory (MKO)
-    MJ_Mag = np.zeros(0)  # Mauna Kea Observatory (MKO)
-    MH_Mag = np.zeros(0)  # Mauna Kea Observatory (MKO)
-    MK_Mag = np.zeros(0)  # Mauna Kea Observatory (MKO)
-    W1_Mag = np.zeros(0)  # WISE
-    W2_Mag = np.zeros(0)  # WISE
-    W3_Mag = np.zeros(0)  # WISE
-    W4_Mag = np.zeros(0)  # WISE
-    S36_Mag = np.zeros(0)  # Spitzer IRAC
-    S45_Mag = np.zeros(0)  # Spitzer IRAC
-    S58_Mag = np.zeros(0)  # Spitzer IRAC
-    S80_Mag = np.zeros(0)  # Spitzer IRAC
-    FUV_Mag = np.zeros(0)  # GALEX
-    NUV_Mag = np.zeros(0)  # GALEX
+    return _interp_atm(atm_type, color, tuple(logteff_logg_grid),
+                       interp_type_atm, regular_grid_atm)
+
+
+@functools.lru_cache(maxsize=64)
+def _interp_atm(atm_type, color, logteff_logg_grid, interp_type_atm,
+                regular_grid_atm):
+    # the cached implementation of interp_atm, logteff_logg_grid is a tuple
+    # only the two columns in the color index are read from the tables
+    try:
+        bands = [_BAND_TO_COL[band] for band in color.split('-', 1)]
+    except KeyError as err:
+        raise ValueError('Unknown passband ' + str(err) + ' in color \'' +
+                         color + '\'.')
+    if len(bands) != 2:
+        raise ValueError('color has to be in the format of \'bp-rp\', '
+                         '\'G-Mbol\', etc.')
+    teff_min = 10.0**logteff_logg_grid[0]
+
+    grid_x, grid_y = np.mgrid[
+        logteff_logg_grid[0]:logteff_logg_grid[1]:logteff_logg_grid[2],
+        logteff_logg_grid[3]:logteff_logg_grid[4]:logteff_logg_grid[5]]
 
     # read the table for all logg
     if atm_type == 'H':
         suffix = 'DA'
     if atm_type == 'He':
         suffix = 'DB'
-    Atm_color = Table.read(dirpath + '/Montreal_atm_grid_2019/Table_' + suffix,
-                           format='ascii')
-    selected = Atm_color['Teff'] > 10**logteff_logg_grid[0]
-    Atm_color = Atm_color[selected]
-
-    table_95 = Atm_color[-51:].copy()
-    table_95['logg'] = 9.5
-    table_95['M/Mo'] = 1.366
-    for column in [
-            'Mbol', 'U', 'B', 'V', 'R', 'I', 'J', 'H', 'Ks', 'MY', 'MJ', 'MH',
-            'MK', 'W1', 'W2', 'W3', 'W4', 'S3.6', 'S4.5', 'S5.8', 'S8.0', 'Su',
-            'Sg', 'Sr', 'Si', 'Sz', 'Pg', 'Pr', 'Pi', 'Pz', 'Py', 'G', 'G_BP',
-            'G_RP', 'FUV', 'NUV'
-    ]:
-        table_95[column] += 1.108
-    Atm_color = vstack((Atm_color, table_95))
-
-    selected = Atm_color['Teff'] > 10**logteff_logg_grid[0]
-    Atm_color = Atm_color[selected]
-
-    # read columns from the Table_DA and Table_DB files
-    logteff = np.concatenate((logteff, np.log10(Atm_color['Teff'])))
-    logg = np.concatenate((logg, Atm_color['logg']))
-    Mbol = np.concatenate((Mbol, Atm_color['Mbol']))
-    bp_Mag = np.concatenate((bp_Mag, Atm_color['G_BP']))
-    rp_Mag = np.concatenate((rp_Mag, Atm_color['G_RP']))
-    G_Mag = np.concatenate((G_Mag, Atm_color['G']))
-    Su_Mag = np.concatenate((Su_Mag, Atm_color['Su']))
-    Sg_Mag = np.concatenate((Sg_Mag, Atm_color['Sg']))
-    Sr_Mag = np.concatenate((Sr_Mag, Atm_color['Sr']))
-    Si_Mag = np.concatenate((Si_Mag, Atm_color['Si']))
-    Sz_Mag = np.concatenate((Sz_Mag, Atm_color['Sz']))
-    Pg_Mag = np.concatenate((Pg_Mag, Atm_color['Pg']))
-    Pr_Mag = np.concatenate((Pr_Mag, Atm_color['Pr']))
-    Pi_Mag = np.concatenate((Pi_Mag, Atm_color['Pi']))
-    Pz_Mag = np.concatenate((Pz_Mag, Atm_color['Pz']))
-    Py_Mag = np.concatenate((Py_Mag, Atm_color['Py']))
-    U_Mag = np.concatenate((U_Mag, Atm_color['U']))
-    B_Mag = np.concatenate((B_Mag, Atm_color['B']))
-    V_Mag = np.concatenate((V_Mag, Atm_color['V']))
-    R_Mag = np.concatenate((R_Mag, Atm_color['R']))
-    I_Mag = np.concatenate((I_Mag, Atm_color['I']))
-    J_Mag = np.concatenate((J_Mag, Atm_color['J']))
-    H_Mag = np.concatenate((H_Mag, Atm_color['H']))
-    Ks_Mag = np.concatenate((Ks_Mag, Atm_color['Ks']))
-    MY_Mag = np.concatenate((MY_Mag, Atm_color['MY']))
-    MJ_Mag = np.concatenate((MJ_Mag, Atm_color['MJ']))
-    MH_Mag = np.concatenate((MH_Mag, Atm_color['MH']))
-    MK_Mag = np.concatenate((MK_Mag, Atm_color['MK']))
-    W1_Mag = np.concatenate((W1_Mag, Atm_color['W1']))
-    W2_Mag = np.concatenate((W2_Mag, Atm_color['W2']))
-    W3_Mag = np.concatenate((W3_Mag, Atm_color['W3']))
-    W4_Mag = np.concatenate((W4_Mag, Atm_color['W4']))
-    S36_Mag = np.concatenate((S36_Mag, Atm_color['S3.6']))
-    S45_Mag = np.concatenate((S45_Mag, Atm_color['S4.5']))
-    S58_Mag = np.concatenate((S58_Mag, Atm_color['S5.8']))
-    S80_Mag = np.concatenate((S80_Mag, Atm_color['S8.0']))
-    FUV_Mag = np.concatenate((FUV_Mag, Atm_color['FUV']))
-    NUV_Mag = np.concatenate((NUV_Mag, Atm_color['NUV']))
+    Atm_color = _load_atm_table('Table_' + suffix)
+
+    if regular_grid_atm:
+        # put the table on its (Teff, logg) grid. Both passbands are shifted
+        # by the same amount for the duplicated logg = 9.5 models, so their
+        # color index is the one of logg = 9.0.
+        teff = np.unique(Atm_color['Teff'])
+        logg = np.unique(Atm_color['logg'])
+        z = np.full((len(teff), len(logg) + 1), np.nan)
+        z[np.searchsorted(teff, Atm_color['Teff']),
+          np.searchsorted(logg, Atm_color['logg'])] = (
+              Atm_color[bands[0]] - Atm_color[bands[1]])
+        z[:, -1] = z[:, -2]
+        selected = teff > teff_min
+        z_func = RegularGridInterpolator(
+            (np.log10(teff[selected]), np.append(logg, 9.5)),
+            z[selected],
+            method=interp_type_atm,
+            bounds_error=False,
+            fill_value=np.nan)
+
+        atm_func = _RegularGridMapping(z_func)
+        return atm_func(grid_x, grid_y), atm_func
+
+    # the rows of all tables with Teff > teff_min, and their triangulation,
+    # which is the same for every color
+    columns = _pool_atm_columns(suffix, teff_min, bands)
+    z = columns[bands[0]] - columns[bands[1]]
+    grid_triangulation, triangulation = _triangulate_atm(suffix, teff_min)
+
+    # the grid is interpolated on the points as they are, like griddata, and
+    # the mapping on the rescaled points, like interpolate_2d
+    if interp_type_atm == 'linear':
+        grid_z = LinearNDInterpolator(grid_triangulation, z)(grid_x, grid_y)
+    elif interp_type_atm == 'cubic':
+        grid_z = CloughTocher2DInterpolator(grid_triangulation, z)(grid_x,
+                                                                   grid_y)
+    z_func = _interpolate_on_triangulation(triangulation, z, interp_type_atm)
+    return grid_z, z_func
+
+
+def _pool_atm_columns(suffix, teff_min, bands):
+    # the Teff, logg and band columns of Table_<suffix> and of the
+    # Table_Mass_<mass>_<suffix> tables, for the rows with Teff > teff_min
+    names = ['Teff', 'logg'] + bands
+
+    # the rows of every table are pooled column by column
+    columns = {name: [] for name in names}
+
+    def append_rows(table):
+        for name in names:
+            columns[name].append(table[name])
+
+    Atm_color = _load_atm_table('Table_' + suffix)
+    selected = Atm_color['Teff'] > teff_min
+    Atm_color = {name: Atm_color[name][selected] for name in names}
+    append_rows(Atm_color)
+
+    # duplicate the last 51 rows as the logg = 9.5 models, shifted in one
+    # vectorized operation per passband. They are taken from the rows that
+    # passed the Teff cut, so they do not need to be filtered again.
+    table_95 = {name: Atm_color[name][-51:] for name in names}
+    table_95['logg'] = np.full(len(table_95['Teff']), 9.5)
+    for column in bands:
+        table_95[column] = table_95[column] + 1.108
+    append_rows(table_95)
 
     # read the table for each mass
     # I suppose the color information in this table is from the interpolation
     # of the above table, so I do not need to read it.
-    for mass in [
-            '0.2', '0.3', '0.4', '0.5', '0.6', '0.7', '0.8', '0.9', '1.0',
-            '1.2'
-    ]:
-        Atm_color = Table.read(
-            dirpath + '/Montreal_atm_grid_2019/Table_Mass_' + mass + '_' +
-            suffix,
-            format='ascii')
-        selected = Atm_color['Teff'] > 10**logteff_logg_grid[0]
-        Atm_color = Atm_color[selected]
-
-        # read columns
-        logteff = np.concatenate((logteff, np.log10(Atm_color['Teff'])))
-        logg = np.concatenate((logg, Atm_color['logg']))
-        Mbol = np.concatenate((Mbol, Atm_color['Mbol']))
-        bp_Mag = np.concatenate((bp_Mag, Atm_color['G_BP']))
-        rp_Mag = np.concatenate((rp_Mag, Atm_color['G_RP']))
-        G_Mag = np.concatenate((G_Mag, Atm_color['G']))
-        Su_Mag = np.concatenate((Su_Mag, Atm_color['Su']))
-        Sg_Mag = np.concatenate((Sg_Mag, Atm_color['Sg']))
-        Sr_Mag = np.concatenate((Sr_Mag, Atm_color['Sr']))
-        Si_Mag = np.concatenate((Si_Mag, Atm_color['Si']))
-        Sz_Mag = np.concatenate((Sz_Mag, Atm_color['Sz']))
-        Pg_Mag = np.concatenate((Pg_Mag, Atm_color['Pg']))
-        Pr_Mag = np.concatenate((Pr_Mag, Atm_color['Pr']))
-        Pi_Mag = np.concatenate((Pi_Mag, Atm_color['Pi']))
-        Pz_Mag = np.concatenate((Pz_Mag, Atm_color['Pz']))
-        Py_Mag = np.concatenate((Py_Mag, Atm_color['Py']))
-        U_Mag = np.concatenate((U_Mag, Atm_color['U']))
-        B_Mag = np.concatenate((B_Mag, Atm_color['B']))
-        V_Mag = np.concatenate((V_Mag, Atm_color['V']))
-        R_Mag = np.concatenate((R_Mag, Atm_color['R']))
-        I_Mag = np.concatenate((I_Mag, Atm_color['I']))
-        J_Mag = np.concatenate((J_Mag, Atm_color['J']))
-        H_Mag = np.concatenate((H_Mag, Atm_color['H']))
-        Ks_Mag = np.concatenate((Ks_Mag, Atm_color['Ks']))
-        MY_Mag = np.concatenate((MY_Mag, Atm_color['MY']))
-        MJ_Mag = np.concatenate((MJ_Mag, Atm_color['MJ']))
-        MH_Mag = np.concatenate((MH_Mag, Atm_color['MH']))
-        MK_Mag = np.concatenate((MK_Mag, Atm_color['MK']))
-        W1_Mag = np.concatenate((W1_Mag, Atm_color['W1']))
-        W2_Mag = np.concatenate((W2_Mag, Atm_color['W2']))
-        W3_Mag = np.concatenate((W3_Mag, Atm_color['W3']))
-        W4_Mag = np.concatenate((W4_Mag, Atm_color['W4']))
-        S36_Mag = np.concatenate((S36_Mag, Atm_color['S3.6']))
-        S45_Mag = np.concatenate((S45_Mag, Atm_color['S4.5']))
-        S58_Mag = np.concatenate((S58_Mag, Atm_color['S5.8']))
-        S80_Mag = np.concatenate((S80_Mag, Atm_color['S8.0']))
-        FUV_Mag = np.concatenate((FUV_Mag, Atm_color['FUV']))
-        NUV_Mag = np.concatenate((NUV_Mag, Atm_color['NUV']))
-
-    grid_x, grid_y = np.mgrid[
-        logteff_logg_grid[0]:logteff_logg_grid[1]:logteff_logg_grid[2],
-        logteff_logg_grid[3]:logteff_logg_grid[4]:logteff_logg_grid[5]]
+    for mass in _MONTREAL_MASSES:
+        Atm_color = _load_atm_table('Table_Mass_' + mass + '_' + suffix)
+        selected = Atm_color['Teff'] > teff_min
+        append_rows({name: Atm_color[name][selected] for name in names})
+
+    # join each column over all tables in one go, instead of growing the
+    # arrays table by table
+    return {name: np.concatenate(columns[name]) for name in names}
+
+
+@functools.lru_cache(maxsize=8)
+def _triangulate_atm(suffix, teff_min):
+    # the (logteff, logg) points of _pool_atm_columns do not depend on the
+    # color, so both colors of a model share their triangulations: one of the
+    # points as they are, as griddata makes, and one of the rescaled points,
+    # as interpolate_2d makes
+    columns = _pool_atm_columns(suffix, teff_min, [])
+    logteff = np.log10(columns['Teff'])
+    logg = columns['logg']
+    return (Delaunay(np.array((logteff, logg)).T),
+            _triangulate_2d(logteff, logg))
+
+
+# drops the cached atmosphere grids, like load_model.cache_clear()
+def _interp_atm_cache_clear():
+    _interp_atm.cache_clear()
+    _triangulate_atm.cache_clear()
+
+
+interp_atm.cache_clear = _interp_atm_cache_clear
+
+
+# window functions of the smoothing function in read_cooling_tracks
+_SMOOTH_WINDOWS = {
+    'hanning': np.hanning,
+    'hamming': np.hamming,
+    'bartlett': np.bartlett,
+    'blackman': np.blackman,
+}
+
+# masses of the Fontaine et al. 2001 cooling tracks, as in the file names, and
+# their values in solar mass
+_FONTAINE_MASSES = [
+    '020', '030', '040', '050', '060', '070', '080', '090', '095', '100', '105',
+    '110', '115', '120', '125', '130'
+]
+_FONTAINE_MASS_VALUES = np.array([int(mass)
+                                  for mass in _FONTAINE_MASSES]) / 100
+# file suffix of the Fontaine et al. 2001 cooling tracks for each model
+_FONTAINE_SUFFIX = {'Fontaine2001': '0204', 'Fontaine2001_thin': '0210'}
+
+
+if numexpr is not None:
+
+    def _log_lum_to_Mbol(log_lum):
+        # Mbol = 4.75 - 2.5 * log(L/Lsun), evaluated in one fused pass
+        return numexpr.evaluate('4.75 - 2.5 * log_lum',
+                                local_dict={'log_lum': np.asarray(log_lum)})
+else:
+
+    def _log_lum_to_Mbol(log_lum):
+        # Mbol = 4.75 - 2.5 * log(L/Lsun), with a single output array
+        Mbol = np.multiply(log_lum, -2.5)
+        Mbol += 4.75
+        return Mbol
+
+
+def _mass_region(mass, mass_separation_1, mass_separation_2):
+    # 0, 1 and 2 for the masses covered by the low-, middle- and high-mass
+    # models, and -1 for a mass that falls exactly on one of the separations
+    region = np.digitize(mass, [mass_separation_1, mass_separation_2])
+    region[(mass == mass_separation_1) | (mass == mass_separation_2)] = -1
+    return region
+
+
+# number of cooling-track tables kept in memory between calls, set the
+# environment variable WD_MODELS_CACHE_SIZE to change it
+_COOL_TABLE_CACHE_SIZE = _env_int('WD_MODELS_CACHE_SIZE', 256)
+
+
+@functools.lru_cache(maxsize=_COOL_TABLE_CACHE_SIZE)
+def _read_cool_table(path,
+                     format='ascii.basic',
+                     fast_reader=True,
+                     header_start=None,
+                     data_start=None):
+    # the parsed cooling-track tables are shared between calls, so they must
+    # not be modified in place
+    kwargs = {}
+    if header_start is not None:
+        kwargs['header_start'] = header_start
+    if data_start is not None:
+        kwargs['data_start'] = data_start
+    return _read_ascii(path, format, fast_reader, **kwargs)
+
+
+@functools.lru_cache(maxsize=_COOL_TABLE_CACHE_SIZE)
+def _read_numeric_track(path, step=1):
+    # cooling tracks that only hold numbers under a single header line, as a
+    # structured array. Shared between calls like _read_cool_table.
+    return _read_numeric_table(path, step)
+
+
+def _map_file(path):
+    # map a data file read-only into memory instead of copying it into a
+    # buffer. The OS pages in the parts that are used, and the pages are
+    # shared with other processes reading the same models.
+    with open(path, 'rb') as data_file:
+        mapped = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+    # the files are scanned from start to end (Python 3.8+ on Unix)
+    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    return mapped
+
+
+def _map_lines(path):
+    # the mapped file and the offsets of the starts and ends of its lines,
+    # ends including the newline as in readlines. Only the lines that are
+    # used have to be decoded.
+    mapped = _map_file(path)
+    ends = np.flatnonzero(np.frombuffer(mapped, dtype=np.uint8) == 10) + 1
+    if len(ends) == 0 or ends[-1] < len(mapped):
+        ends = np.append(ends, len(mapped))
+    starts = np.concatenate(([0], ends[:-1]))
+    return mapped, starts, ends
+
+
+def _decode_lines(mapped, starts, ends):
+    # the mapped lines between the given offsets as strings
+    return [
+        mapped[start:end].decode()
+        for start, end in zip(starts.tolist(), ends.tolist())
+    ]
 
-    # define the interpolation of mapping
-    def interp(x, y, z, interp_type_atm='linear'):
-        grid_z = griddata(np.array((x, y)).T,
-                          z, (grid_x, grid_y),
-                          method=interp_type_atm)
-        z_func = interpolate_2d(x, y, z, interp_type_atm)
-        return grid_z, z_func
-
-    division = color.find('-')
-    if '-Mbol' in color:
-        z = eval(color[:division] + '_Mag - Mbol')
-    else:
-        z = eval(color[:division] + '_Mag - ' + color[division + 1:] + '_Mag')
 
-    return interp(logteff, logg, z, interp_type_atm)
+@functools.lru_cache(maxsize=_COOL_TABLE_CACHE_SIZE)
+def _read_mesa_track(path, n_rows=40):
+    # the MESA tracks are csv files with the column names on the second line.
+    # About n_rows evenly spaced rows are kept, and only those are decoded
+    # and parsed.
+    mapped, starts, ends = _map_lines(path)
+    step = (len(starts) - 2) // n_rows
+    return np.loadtxt(_decode_lines(mapped, starts[2::step], ends[2::step]),
+                      dtype=[(name.strip(), float) for name in
+                             mapped[starts[1]:ends[1]].decode().split(',')],
+                      delimiter=',',
+                      ndmin=1)
+
+
+# number of threads reading the files of a model at the same time
+_N_READ_THREADS = min(8, os.cpu_count() or 1)
+
+
+def _read_in_threads(read, paths, **kwargs):
+    # the files of a model are independent, so they are parsed concurrently.
+    # Most of the parsing runs in C and I/O code outside of the GIL.
+    with ThreadPoolExecutor(max_workers=_N_READ_THREADS) as executor:
+        return list(executor.map(lambda path: read(path, **kwargs), paths))
+
+
+# a model of the Fontaine et al. 2001 tracks, a fixed-width record of three
+# lines
+_FONTAINE_EXAMPLE = ('      1    57674.0025    8.36722799  7.160654E+08 '
+                     ' 4.000000E+05  4.042436E+33\n'
+                     '        7.959696E+00  2.425570E+01  7.231926E+00 '
+                     ' 0.0000000000  0.000000E+00\n'
+                     '        6.019629E+34 -4.010597E+00 -1.991404E+00 '
+                     '-3.055254E-01 -3.055254E-01')
+_FONTAINE_RECORD_LEN = len(_FONTAINE_EXAMPLE)
+# the fixed-width fields of a record as a structured dtype
+_FONTAINE_RECORD = np.dtype({
+    'names': ['teff', 'logg', 'age', 'lum'],
+    'formats': ['S12', 'S13', 'S15', 'S12'],
+    'offsets': [9, 22, 48, 64],
+    'itemsize': _FONTAINE_RECORD_LEN
+})
+# the fields read from the tracks with the crystallized fraction X
+_FONTAINE_X_RECORD = np.dtype({
+    'names': ['teff', 'logg', 'lum', 'X'],
+    'formats': ['S12', 'S13', 'S12', 'S12'],
+    'offsets': [9, 22, 64, 79 + 48],
+    'itemsize': _FONTAINE_RECORD_LEN
+})
+
+
+def _fontaine_logteff_Mbol(records):
+    # logteff and Mbol of Fontaine track records. The logarithms are taken
+    # on whole columns, in place on the converted arrays.
+    logteff = records['teff'].astype(float)
+    np.log10(logteff, out=logteff)
+    log_lum = records['lum'].astype(float)
+    log_lum /= 3.828e33
+    np.log10(log_lum, out=log_lum)
+    return logteff, _log_lum_to_Mbol(log_lum)
+
+
+@functools.lru_cache(maxsize=_COOL_TABLE_CACHE_SIZE)
+def _read_fontaine_track(path):
+    # read the logteff, logg, cooling age and Mbol of a Fontaine et al. 2001
+    # cooling track. Each model is a fixed-width record of three lines, the
+    # whole file is viewed as an array of records and the fixed-width fields
+    # are converted to float by numpy, without slicing the text into Python
+    # strings. The files are ASCII, so they are read as bytes and the
+    # offsets are the same as in characters.
+    with open(path, 'rb') as f:
+        text = f.read()
+    records = np.frombuffer(text,
+                            dtype=_FONTAINE_RECORD,
+                            count=len(text) // _FONTAINE_RECORD_LEN)
+
+    # the derived columns are cached with the track, not redone per call
+    logteff, Mbol = _fontaine_logteff_Mbol(records)
+    return (logteff, records['logg'].astype(float),
+            records['age'].astype(float), Mbol)
+
+
+def _hashable(value):
+    # lists and arrays among the arguments are keyed by their values
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+# MS ages of the track masses of a model, keyed by the hashable versions of
+# the MS_age arguments, least recently used first
+_MS_AGE_CACHE = collections.OrderedDict()
+_MS_AGE_CACHE_SIZE = 512
+
+
+def _cached_MS_age(mass_values, *args):
+    # MS_age of the track masses. The same masses recur in every load_model
+    # call, and the returned array is shared between them, so it is
+    # read-only. The hashable arguments are only the key, MS_age is called
+    # with the arguments as given. Raises TypeError for arguments that cannot
+    # be hashed.
+    key = (_hashable(mass_values), ) + tuple(map(_hashable, args))
+    if key in _MS_AGE_CACHE:
+        _MS_AGE_CACHE.move_to_end(key)
+        return _MS_AGE_CACHE[key]
+    ages = MS_age(np.asarray(mass_values, dtype=float), *args)
+    ages.flags.writeable = False
+    _MS_AGE_CACHE[key] = ages
+    if len(_MS_AGE_CACHE) > _MS_AGE_CACHE_SIZE:
+        _MS_AGE_CACHE.popitem(last=False)
+    return ages
 
 
 def read_cooling_tracks(low_mass_model,
@@ -685,118 +1065,91 @@ def read_cooling_tracks(low_mass_model,
     if high_mass_model == 'BaSTI' or high_mass_model == 'BaSTInosep':
         mass_separation_2 = 0.99
 
-    # initialize data points of cooling tracks
-    logg = np.zeros(0)
-    age = np.zeros(0)
-    age_cool = np.zeros(0)
-    logteff = np.zeros(0)
-    mass_array = np.zeros(0)
-    Mbol = np.zeros(0)
+    # initialize data points of cooling tracks. The tracks are collected in
+    # lists and joined once at the end, instead of growing the arrays track by
+    # track.
+    mass_array_chunks = [np.zeros(0)]
+    logg_chunks = [np.zeros(0)]
+    age_chunks = [np.zeros(0)]
+    age_cool_chunks = [np.zeros(0)]
+    logteff_chunks = [np.zeros(0)]
+    Mbol_chunks = [np.zeros(0)]
 
     if atm_type == 'H':
         spec_suffix2 = 'DA'
     if atm_type == 'He':
         spec_suffix2 = 'DB'
 
+    # the model used in each mass region
+    region_models = (low_mass_model, middle_mass_model, high_mass_model)
+
+    def ms_age_of(mass_values):
+        # the MS ages of all tracks of a model in one vectorized MS_age call
+        if len(mass_values) == 0:
+            return np.zeros(0)
+        args = (ms_model, ms_coeff, ms_interpolator, ifmr_model,
+                ifmr_fill_value, ifmr_mass)
+        try:
+            return _cached_MS_age(mass_values, *args)
+        except TypeError:
+            # an argument that cannot be hashed, e.g. a custom interpolator
+            return MS_age(np.asarray(mass_values, dtype=float), *args)
+
     # read data from cooling models
     # Fontaine et al. 2001
-    for mass in [
-            '020', '030', '040', '050', '060', '070', '080', '090', '095',
-            '100', '105', '110', '115', '120', '125', '130'
-    ]:
-        if int(mass) / 100 < mass_separation_1 and atm_type == 'H':
-            if low_mass_model == 'Fontaine2001':
-                spec_suffix = '0204'
-            elif low_mass_model == 'Fontaine2001_thin':
-                spec_suffix = '0210'
-            else:
-                continue
-        elif (int(mass) / 100 > mass_separation_1
-              and int(mass) / 100 < mass_separation_2 and atm_type == 'H'):
-            if middle_mass_model == 'Fontaine2001':
-                spec_suffix = '0204'
-            elif middle_mass_model == 'Fontaine2001_thin':
-                spec_suffix = '0210'
-            else:
-                continue
-        elif int(mass) / 100 > mass_separation_2 and atm_type == 'H':
-            if high_mass_model == 'Fontaine2001':
-                spec_suffix = '0204'
-            elif high_mass_model == 'Fontaine2001_thin':
-                spec_suffix = '0210'
-            else:
-                continue
-        else:
+    tracks = []
+    for mass, mass_value, region in zip(
+            _FONTAINE_MASSES, _FONTAINE_MASS_VALUES,
+            _mass_region(_FONTAINE_MASS_VALUES, mass_separation_1,
+                         mass_separation_2)):
+        if atm_type != 'H' or region < 0:
             continue
-        f = open(dirpath + '/cooling_models/Fontaine_AllSequences/CO_' + mass +
-                 spec_suffix)
-        text = f.read()
-        example = ('      1    57674.0025    8.36722799  7.160654E+08 '
-                   ' 4.000000E+05  4.042436E+33\n'
-                   '        7.959696E+00  2.425570E+01  7.231926E+00 '
-                   ' 0.0000000000  0.000000E+00\n'
-                   '        6.019629E+34 -4.010597E+00 -1.991404E+00 '
-                   '-3.055254E-01 -3.055254E-01')
-        logg_temp = []
-        age_temp = []
-        age_cool_temp = []
-        logteff_temp = []
-        Mbol_temp = []
-        l_line = len(example)
-        for line in range(len(text) // l_line):
-            logteff_temp.append(
-                np.log10(float(text[line * l_line + 9:line * l_line + 21])))
-            logg_temp.append(float(text[line * l_line + 22:line * l_line +
-                                        35]))
-            age_temp.append(
-                float(text[line * l_line + 48:line * l_line + 63]) + float(
-                    MS_age(
-                        int(mass) / 100, ms_model, ms_coeff, ms_interpolator,
-                        ifmr_model, ifmr_fill_value, ifmr_mass)))
-            age_cool_temp.append(
-                float(text[line * l_line + 48:line * l_line + 63]))
-            Mbol_temp.append(4.75 - 2.5 * np.log10(
-                float(text[line * l_line + 64:line * l_line + 76]) / 3.828e33))
-        mass_array = np.concatenate(
-            (mass_array, np.ones(len(age_temp)) * int(mass) / 100))
-        logg = np.concatenate((logg, logg_temp))
-        age = np.concatenate((age, age_temp))
-        age_cool = np.concatenate((age_cool, age_cool_temp))
-        logteff = np.concatenate((logteff, logteff_temp))
-        Mbol = np.concatenate((Mbol, Mbol_temp))
-        f.close()
+        spec_suffix = _FONTAINE_SUFFIX.get(region_models[region])
+        if spec_suffix is None:
+            continue
+        tracks.append((mass, mass_value, spec_suffix))
+    ms_ages = ms_age_of([mass_value for _, mass_value, _ in tracks])
+    track_columns = _read_in_threads(_read_fontaine_track, [
+        dirpath + '/cooling_models/Fontaine_AllSequences/CO_' + mass +
+        spec_suffix for mass, _, spec_suffix in tracks
+    ])
+    for (mass, mass_value, spec_suffix), ms_age, columns in zip(
+            tracks, ms_ages, track_columns):
+        logteff_temp, logg_temp, age_cool_temp, Mbol_temp = columns
+        age_temp = np.add(age_cool_temp, ms_age)
+        mass_array_chunks.append(np.full(len(age_temp), mass_value))
+        logg_chunks.append(logg_temp)
+        age_chunks.append(age_temp)
+        age_cool_chunks.append(age_cool_temp)
+        logteff_chunks.append(logteff_temp)
+        Mbol_chunks.append(Mbol_temp)
 
     # Montreal He-atmosphere model
-    for mass in [
-            '0.2', '0.3', '0.4', '0.5', '0.6', '0.7', '0.8', '0.9', '1.0',
-            '1.2'
-    ]:
-        if ((float(mass) < mass_separation_1
-             and low_mass_model == 'Fontaine2001') or
-            (float(mass) > mass_separation_1
-             and float(mass) < mass_separation_2
-             and middle_mass_model == 'Fontaine2001') or
-            (float(mass) > mass_separation_2
-             and high_mass_model == 'Fontaine2001')) and atm_type == 'He':
-            Cool = Table.read(dirpath + '/Montreal_atm_grid_2019/Table_Mass_' +
-                              mass + '_' + spec_suffix2,
-                              format='ascii')
-            Cool = Cool[::1]
-            mass_array = np.concatenate(
-                (mass_array, np.ones(len(Cool)) * float(mass)))
-            logg = np.concatenate((logg, Cool['logg']))
-            age = np.concatenate(
-                (age, Cool['Age'] +
-                 MS_age(float(mass), ms_model, ms_coeff, ms_interpolator,
-                        ifmr_model, ifmr_fill_value, ifmr_mass)))
-            age_cool = np.concatenate((age_cool, Cool['Age']))
-            logteff = np.concatenate((logteff, np.log10(Cool['Teff'])))
-            Mbol = np.concatenate((Mbol, Cool['Mbol']))
+    if atm_type == 'He':
+        masses = [
+            (mass, mass_value) for mass, mass_value, region in zip(
+                _MONTREAL_MASSES, _MONTREAL_MASS_VALUES,
+                _mass_region(_MONTREAL_MASS_VALUES, mass_separation_1,
+                             mass_separation_2))
+            if region >= 0 and region_models[region] == 'Fontaine2001'
+        ]
+        tables = _read_in_threads(
+            _load_atm_table,
+            ['Table_Mass_' + mass + '_' + spec_suffix2 for mass, _ in masses])
+        ms_ages = ms_age_of([mass_value for _, mass_value in masses])
+        for (mass, mass_value), Cool, ms_age in zip(masses, tables, ms_ages):
+            mass_array_chunks.append(np.full(len(Cool['Age']), mass_value))
+            logg_chunks.append(Cool['logg'])
+            age_cool = np.asarray(Cool['Age'])
+            age_chunks.append(np.add(age_cool, ms_age))
+            age_cool_chunks.append(age_cool)
+            logteff_chunks.append(np.log10(Cool['Teff']))
+            Mbol_chunks.append(Cool['Mbol'])
 
     # define a smoothing function for future extension. Now it just returns the
     # input x vector.
     def smooth(x, window_len=5, window='hanning'):
-        w = eval('np.' + window + '(window_len)')
+        w = _SMOOTH_WINDOWS[window](window_len)
         y = np.convolve(w / w.sum(), x, mode='same')
         return x
 
@@ -813,22 +1166,23 @@ def read_cooling_tracks(low_mass_model,
                 '0505', '0553', '0593', '0627', '0660', '0692', '0863'
             ]
             metallicity = '0001'
-        for mass in Renedo_masslist:
-            Cool = Table.read(
-                dirpath + '/cooling_models/Renedo_2010_DA_CO/wdtracks_z' +
-                metallicity + '/wd' + mass + '_z' + metallicity + '.trk',
-                format='ascii')
-            Cool = Cool[::
-                        5]  #[(Cool['log(TEFF)'] > logteff_min) * (Cool['log(TEFF)'] < logteff_max)]
-            mass_array = np.concatenate(
-                (mass_array, np.ones(len(Cool)) * int(mass) / 1000))
-            logg = np.concatenate((logg, Cool['Log(grav)']))
-            age = np.concatenate((age, Cool['age/Myr'] * 1e6 + MS_age(
-                int(mass) / 1000, ms_model, ms_coeff, ms_interpolator,
-                ifmr_model, ifmr_fill_value, ifmr_mass)))
-            age_cool = np.concatenate((age_cool, Cool['age/Myr'] * 1e6))
-            logteff = np.concatenate((logteff, Cool['log(TEFF)']))
-            Mbol = np.concatenate((Mbol, 4.75 - 2.5 * Cool['log(L)']))
+        ms_ages = ms_age_of([int(mass) / 1000 for mass in Renedo_masslist])
+        # every 5th model is read
+        #[(Cool['log(TEFF)'] > logteff_min) * (Cool['log(TEFF)'] < logteff_max)]
+        tables = _read_in_threads(_read_numeric_track, [
+            dirpath + '/cooling_models/Renedo_2010_DA_CO/wdtracks_z' +
+            metallicity + '/wd' + mass + '_z' + metallicity + '.trk'
+            for mass in Renedo_masslist
+        ],
+                                  step=5)
+        for mass, ms_age, Cool in zip(Renedo_masslist, ms_ages, tables):
+            mass_array_chunks.append(np.full(len(Cool), int(mass) / 1000))
+            logg_chunks.append(Cool['Log(grav)'])
+            age_cool = np.asarray(Cool['age/Myr']) * 1e6
+            age_chunks.append(np.add(age_cool, ms_age))
+            age_cool_chunks.append(age_cool)
+            logteff_chunks.append(Cool['log(TEFF)'])
+            Mbol_chunks.append(_log_lum_to_Mbol(Cool['log(L)']))
             # additional
             logT_c = Cool['logT_c']
             logrho_c = Cool['logRo_c']
@@ -840,43 +1194,43 @@ def read_cooling_tracks(low_mass_model,
 
     # CO, DB (Camisassa et al. 2017)
     if middle_mass_model == 'Camisassa2017' and atm_type == 'He':
-        for mass in ['051', '054', '058', '066', '074', '087', '100']:
-            if int(mass) / 100 < mass_separation_2:
-                Cool = Table.read(
-                    dirpath + '/cooling_models/Camisassa_2017_DB_CO/Z002/' +
-                    mass + 'DB.trk',
-                    format='ascii')
-                dn = 1
-                if int(mass) / 100 > 0.95:
-                    dn = 50
-                Cool = Cool[::
-                            dn]  # [(Cool['LOG(TEFF)'] > logteff_min) * (Cool['LOG(TEFF)'] < logteff_max)]
-                #Cool.sort('Log(edad/Myr)')
-                mass_array = np.concatenate(
-                    (mass_array, np.ones(len(Cool)) * int(mass) / 100))
-                logg = np.concatenate((logg, Cool['Log(grav)']))
-                age = np.concatenate((age, 10**Cool['Log(edad/Myr)'] * 1e6))
-                age_cool = np.concatenate(
-                    (age_cool,
-                     (10**Cool['Log(edad/Myr)'] - 10**Cool['Log(edad/Myr)'][0])
-                     * 1e6))
-                logteff = np.concatenate((logteff, Cool['LOG(TEFF)']))
-                Mbol = np.concatenate((Mbol, 4.75 - 2.5 * Cool['LOG(L)']))
-                # additional
-                logT_c = Cool['T_c'] + 6
-                logrho_c = Cool['Ro_c']
-                XH_c = Cool['Hc']
-                XHe_c = Cool['Hec']
-                mass_accurate = Cool['Masa']
-                logL_nu = Cool['Log(Lnu)']
-                logMH = Cool['LogMHtot']
-                logHeBuf = Cool['LogHeBuf']
-                logr = np.log10(Cool['R/R_sun'])
-                L_LH = Cool['L.H.[erg/s)]'] / 3.828e33
-                L_PS = Cool['Sep.Fase[erg/s]'] / 3.828e33
-                del Cool
+        Camisassa_masslist = [
+            mass for mass in ['051', '054', '058', '066', '074', '087', '100']
+            if int(mass) / 100 < mass_separation_2
+        ]
+        # every model is read, every 50th above 0.95 Msun
+        # [(Cool['LOG(TEFF)'] > logteff_min) * (Cool['LOG(TEFF)'] < logteff_max)]
+        tables = _read_in_threads(lambda track: _read_numeric_track(*track), [
+            (dirpath + '/cooling_models/Camisassa_2017_DB_CO/Z002/' + mass +
+             'DB.trk', 50 if int(mass) / 100 > 0.95 else 1)
+            for mass in Camisassa_masslist
+        ])
+        for mass, Cool in zip(Camisassa_masslist, tables):
+            #Cool.sort('Log(edad/Myr)')
+            mass_array_chunks.append(np.full(len(Cool), int(mass) / 100))
+            logg_chunks.append(Cool['Log(grav)'])
+            age_chunks.append(10**Cool['Log(edad/Myr)'] * 1e6)
+            age_cool_chunks.append(
+                (10**Cool['Log(edad/Myr)'] - 10**Cool['Log(edad/Myr)'][0])
+                * 1e6)
+            logteff_chunks.append(Cool['LOG(TEFF)'])
+            Mbol_chunks.append(_log_lum_to_Mbol(Cool['LOG(L)']))
+            # additional
+            logT_c = Cool['T_c'] + 6
+            logrho_c = Cool['Ro_c']
+            XH_c = Cool['Hc']
+            XHe_c = Cool['Hec']
+            mass_accurate = Cool['Masa']
+            logL_nu = Cool['Log(Lnu)']
+            logMH = Cool['LogMHtot']
+            logHeBuf = Cool['LogHeBuf']
+            logr = np.log10(Cool['R/R_sun'])
+            L_LH = Cool['L.H.[erg/s)]'] / 3.828e33
+            L_PS = Cool['Sep.Fase[erg/s]'] / 3.828e33
+            del Cool
 
     # BaSTI model
+    tracks = []
     for mass in [
             '054', '055', '061', '068', '077', '087', '100', '110', '120'
     ]:
@@ -896,49 +1250,55 @@ def read_cooling_tracks(low_mass_model,
                 continue
         else:
             continue
-        Cool = Table.read(dirpath + '/cooling_models/BaSTI/COOL' + mass +
-                          'BaSTIfinale' + spec_suffix2 + sep + '.sdss',
-                          format='ascii')
+        tracks.append((mass, sep))
+    ms_ages = ms_age_of([int(mass) / 100 for mass, _ in tracks])
+    tables = _read_in_threads(_read_cool_table, [
+        dirpath + '/cooling_models/BaSTI/COOL' + mass + 'BaSTIfinale' +
+        spec_suffix2 + sep + '.sdss' for mass, sep in tracks
+    ],
+                              format='ascii.commented_header')
+    for (mass, sep), ms_age, Cool in zip(tracks, ms_ages, tables):
         dn = 1
         if int(mass) / 100 > 1.05:
             dn = 5
         Cool = Cool[::
                     dn]  # [(Cool['log(Teff)'] > logteff_min) * (Cool['log(Teff)'] < logteff_max)]
         #Cool.sort('Log(edad/Myr)')
-        Cool['Log(grav)'] = logg_func(Cool['log(Teff)'],
-                                      np.ones(len(Cool)) * int(mass) / 100)
-        mass_array = np.concatenate(
-            (mass_array, np.ones(len(Cool)) * int(mass) / 100))
-        logg = np.concatenate((logg, Cool['Log(grav)']))
-        age = np.concatenate((age, 10**Cool['log(t)'] + MS_age(
-            int(mass) / 100, ms_model, ms_coeff, ms_interpolator, ifmr_model,
-            ifmr_fill_value, ifmr_mass)))
-        age_cool = np.concatenate((age_cool, 10**Cool['log(t)']))
-        logteff = np.concatenate((logteff, Cool['log(Teff)']))
-        Mbol = np.concatenate((Mbol, 4.75 - 2.5 * Cool['log(L/Lo)']))
+        # BaSTI provides no logg, it is derived from Teff and mass without
+        # adding a column to the cached table. The interpolator broadcasts
+        # the scalar mass against the Teff column.
+        logg_chunks.append(
+            logg_func(np.asarray(Cool['log(Teff)']), int(mass) / 100))
+        mass_array_chunks.append(np.full(len(Cool), int(mass) / 100))
+        age_cool = np.power(10., Cool['log(t)'])
+        age_chunks.append(np.add(age_cool, ms_age))
+        age_cool_chunks.append(age_cool)
+        logteff_chunks.append(Cool['log(Teff)'])
+        Mbol_chunks.append(_log_lum_to_Mbol(Cool['log(L/Lo)']))
         del Cool
 
     # Ultra-massive ONe model (Camisassa et al. 2019)
     if high_mass_model == 'ONe':
-        for mass in ['110', '116', '122', '129']:
-            Cool = Table.read(dirpath + '/cooling_models/ONeWDs/' + mass +
-                              '_' + spec_suffix2 + '.trk',
-                              format='ascii')
-            Cool = Cool[::
-                        10]  # (Cool['LOG(TEFF)'] > logteff_min) * (Cool['LOG(TEFF)'] < logteff_max)
+        ONe_masslist = ['110', '116', '122', '129']
+        ms_ages = ms_age_of([int(mass) / 100 for mass in ONe_masslist])
+        # every 10th model is read
+        # (Cool['LOG(TEFF)'] > logteff_min) * (Cool['LOG(TEFF)'] < logteff_max)
+        tables = _read_in_threads(_read_numeric_track, [
+            dirpath + '/cooling_models/ONeWDs/' + mass + '_' + spec_suffix2 +
+            '.trk' for mass in ONe_masslist
+        ],
+                                  step=10)
+        for mass, ms_age, Cool in zip(ONe_masslist, ms_ages, tables):
             #Cool.sort('Log(edad/Myr)')
-            mass_array = np.concatenate(
-                (mass_array, np.ones(len(Cool)) * int(mass) / 100))
-            logg = np.concatenate((logg, Cool['Log(grav)']))
-            age         = np.concatenate(( age, (10**Cool['Log(edad/Myr)'] -
-                                                 10**Cool['Log(edad/Myr)'][0]) * 1e6 + \
-                                                 MS_age(int(mass)/100, ms_model, ms_coeff, ms_interpolator, ifmr_model, ifmr_fill_value, ifmr_mass )))
-            age_cool = np.concatenate(
-                (age_cool,
-                 (10**Cool['Log(edad/Myr)'] - 10**Cool['Log(edad/Myr)'][0]) *
-                 1e6))
-            logteff = np.concatenate((logteff, Cool['LOG(TEFF)']))
-            Mbol = np.concatenate((Mbol, 4.75 - 2.5 * Cool['LOG(L)']))
+            mass_array_chunks.append(np.full(len(Cool), int(mass) / 100))
+            logg_chunks.append(Cool['Log(grav)'])
+            age_cool = np.power(10., Cool['Log(edad/Myr)'])
+            age_cool -= age_cool[0]
+            age_cool *= 1e6
+            age_chunks.append(np.add(age_cool, ms_age))
+            age_cool_chunks.append(age_cool)
+            logteff_chunks.append(Cool['LOG(TEFF)'])
+            Mbol_chunks.append(_log_lum_to_Mbol(Cool['LOG(L)']))
             # additional
             logT_c = Cool['T_c'] + 6
             logrho_c = Cool['Ro_c']
@@ -987,45 +1347,56 @@ def read_cooling_tracks(low_mass_model,
 #                              ['1.0124','1.0645',
 #                              '1.1102','1.151',
 #                              '1.2163','1.2671','1.3075']
-        for mass in mesa_masslist:
-            Cool = Table.read(dirpath + '/cooling_models/MESA_model/' +
-                              atm_type + '_atm-M' + mass + '.dat',
-                              format='csv',
-                              header_start=1,
-                              data_start=2)
-            dn = 70
-            if float(mass) > 1.2:
-                dn = 120
-            if float(mass) < 1.05 or atm_type == 'He':
-                dn = 10
-            dn = len(Cool) // 40
-            Cool = Cool[::
-                        dn]  # [(Cool['# log Teff [K]'] > logteff_min) * (Cool['# log Teff [K]'] < logteff_max)]
-            mass_array = np.concatenate(
-                (mass_array, np.ones(len(Cool)) * float(mass)))
-            logg = np.concatenate((logg, Cool['log g [cm/s^2]']))
-            age = np.concatenate((age, Cool['total age [Gyr]'] * 1e9))
-            age_cool = np.concatenate(
-                (age_cool, Cool['cooling age [Gyr]'] * 1e9))
-            logteff = np.concatenate((logteff, Cool['# log Teff [K]']))
-            Mbol = np.concatenate((Mbol, 4.75 - 2.5 * Cool['log L/Lsun']))
+        # about 40 models of each track are read
+        #dn = 70
+        #if float(mass) > 1.2:
+        #    dn = 120
+        #if float(mass) < 1.05 or atm_type == 'He':
+        #    dn = 10
+        # [(Cool['# log Teff [K]'] > logteff_min) * (Cool['# log Teff [K]'] < logteff_max)]
+        tables = _read_in_threads(_read_mesa_track, [
+            dirpath + '/cooling_models/MESA_model/' + atm_type + '_atm-M' +
+            mass + '.dat' for mass in mesa_masslist
+        ])
+        for mass, Cool in zip(mesa_masslist, tables):
+            mass_array_chunks.append(np.full(len(Cool), float(mass)))
+            logg_chunks.append(Cool['log g [cm/s^2]'])
+            age_chunks.append(Cool['total age [Gyr]'] * 1e9)
+            age_cool_chunks.append(Cool['cooling age [Gyr]'] * 1e9)
+            logteff_chunks.append(Cool['# log Teff [K]'])
+            Mbol_chunks.append(_log_lum_to_Mbol(Cool['log L/Lsun']))
             # additional
             mass_accurate = Cool['mass [Msun]']
             logr = Cool['log radius [Rsun]']
             del Cool
 
-    select = ~np.isnan(mass_array + logg + age + age_cool + logteff + Mbol) * \
-             (age_cool > 1e3)
+    # join the cooling tracks into the rows of one (6, N) array, so all the
+    # columns share a single allocation and each stays contiguous
+    chunks = (mass_array_chunks, logg_chunks, age_chunks, age_cool_chunks,
+              logteff_chunks, Mbol_chunks)
+    tracks = np.empty((len(chunks), sum(len(chunk) for chunk in Mbol_chunks)))
+    for row, column_chunks in zip(tracks, chunks):
+        np.concatenate(column_chunks, out=row)
+
+    # keep the models with no NaN in any column, built up in place on one
+    # boolean mask instead of summing the columns
+    select = tracks[3] > 1e3
+    for row in tracks:
+        select &= ~np.isnan(row)
+    tracks = tracks[:, select]
+    tracks[2:4] *= 1e-9
 
-    return mass_array[select], logg[select], age[select]*1e-9, age_cool[select]*1e-9, \
-           logteff[select], Mbol[select]
+    mass_array, logg, age, age_cool, logteff, Mbol = tracks
+    return mass_array, logg, age, age_cool, logteff, Mbol
 
 
 def interp_HR_to_para(color,
                       Mag,
                       WD_para,
                       HR_grid=(-0.6, 1.5, 0.002, 8, 18, 0.01),
-                      interp_type='linear'):
+                      interp_type='linear',
+                      triangulation=None,
+                      regular_grid=False):
     """
     Interpolate the mapping of HR coordinate --> WD_para, based on the data 
     points from many cooling tracks read from a model, and get the value of a
@@ -1044,6 +1415,16 @@ def interp_HR_to_para(color,
                         color and Mag
         interp_type:    String. {'linear', 'cubic'}. *Optional*
                         Linear is better for this purpose.
+        triangulation:  Tuple. *Optional*
+                        The output of triangulate_HR(color, Mag, HR_grid). It
+                        is reused instead of triangulating the data points
+                        again, if WD_para selects the same data points.
+        regular_grid:   Bool. *Optional*
+                        If true, HR_to_para interpolates grid_para bilinearly
+                        instead of the data points on their triangulation.
+                        This is several times faster for many HR coordinates,
+                        but only as accurate as the grid, and NaN within one
+                        grid step of the edges of the data.
 
     Returns:
         grid_para:      2d-array. 
@@ -1057,21 +1438,190 @@ def interp_HR_to_para(color,
                               HR_grid[3]:HR_grid[4]:HR_grid[5]]
 
     # select only not-NaN data points
+    selected = _select_HR(color, Mag, WD_para, HR_grid)
+
+    # get the value of z on a H-R diagram grid and the interpolated mapping
+    if triangulation is None or not np.array_equal(selected,
+                                                    triangulation[0]):
+        triangulation = triangulate_HR(color, Mag, HR_grid, WD_para)
+    HR_to_para = _interpolate_on_triangulation(triangulation[1:],
+                                               WD_para[selected], interp_type)
+    grid_para = HR_to_para(grid_x, grid_y)
+    if regular_grid:
+        HR_to_para = _interpolate_on_grid(grid_x, grid_y, grid_para)
+
+    # return both the grid data and interpolated mapping
+    return grid_para, HR_to_para
+
+
+def triangulate_HR(color, Mag, HR_grid=(-0.6, 1.5, 0.002, 8, 18, 0.01),
+                   WD_para=None):
+    """
+    Triangulate the data points on the HR diagram once, so that the mappings
+    of several WD parameters can be interpolated on the same triangulation with
+    interp_HR_to_para.
+
+    Args:
+        color:          1d-array. 
+                        The color index
+        Mag:            1d-array. 
+                        The absolute magnitude
+        HR_grid:        (xmin, xmax, dx, ymin, ymax, dy). *Optional*
+                        The grid information of the H-R diagram coordinates 
+                        color and Mag
+        WD_para:        1d-array. *Optional*
+                        Data points where WD_para is NaN are left out
+
+    Returns:
+        triangulation:  Tuple.
+                        The selected data points, the Delaunay triangulation
+                        and the offset and scale of its rescaled coordinates
+
+    """
+    # select only not-NaN data points
+    if WD_para is None:
+        WD_para = np.zeros(len(color))
+    selected = _select_HR(color, Mag, WD_para, HR_grid)
+    return (selected, ) + _triangulate_2d(color[selected], Mag[selected])
+
+
+def interp_HR_to_paras(color,
+                       Mag,
+                       WD_paras,
+                       HR_grid=(-0.6, 1.5, 0.002, 8, 18, 0.01),
+                       interp_type='linear',
+                       triangulation=None,
+                       regular_grid=False):
+    """
+    Interpolate the mappings of HR coordinate --> WD_para for several WD
+    parameters on the same data points, as interp_HR_to_para does for each of
+    them. The parameters that select the same data points are interpolated
+    by one interpolator with several values, so the grid of HR coordinates
+    is located on the triangulation only once.
+
+    Args:
+        color:          1d-array. 
+                        The color index
+        Mag:            1d-array. 
+                        The absolute magnitude
+        WD_paras:       List of 1d-arrays. 
+                        The target parameters for mapping HR --> WD_para
+        HR_grid:        (xmin, xmax, dx, ymin, ymax, dy). *Optional*
+                        The grid information of the H-R diagram coordinates 
+                        color and Mag
+        interp_type:    String. {'linear', 'cubic'}. *Optional*
+                        Linear is better for this purpose.
+        triangulation:  Tuple. *Optional*
+                        (See the interp_HR_to_para function)
+        regular_grid:   Bool. *Optional*
+                        (See the interp_HR_to_para function)
+
+    Returns:
+        A list of (grid_para, HR_to_para) of each WD_para, as returned by
+        interp_HR_to_para
+
+    """
+    # define the grid of H-R diagram
+    grid_x, grid_y = np.mgrid[HR_grid[0]:HR_grid[1]:HR_grid[2],
+                              HR_grid[3]:HR_grid[4]:HR_grid[5]]
+
+    # group the parameters by the data points they select
+    groups = []
+    for i, WD_para in enumerate(WD_paras):
+        selected = _select_HR(color, Mag, WD_para, HR_grid)
+        for group_selected, indices in groups:
+            if np.array_equal(selected, group_selected):
+                indices.append(i)
+                break
+        else:
+            groups.append((selected, [i]))
+
+    results = [None] * len(WD_paras)
+    for selected, indices in groups:
+        if triangulation is None or not np.array_equal(
+                selected, triangulation[0]):
+            triangulation = triangulate_HR(color, Mag, HR_grid,
+                                           WD_paras[indices[0]])
+        HR_to_paras = _interpolate_on_triangulation(
+            triangulation[1:],
+            np.column_stack([WD_paras[i][selected] for i in indices]),
+            interp_type)
+        grid_paras = HR_to_paras(grid_x, grid_y)
+        for column, i in enumerate(indices):
+            grid_para = np.ascontiguousarray(grid_paras[..., column])
+            if regular_grid:
+                HR_to_para = _interpolate_on_grid(grid_x, grid_y, grid_para)
+            elif interp_type == 'linear':
+                # a linear interpolator of one parameter costs nothing to
+                # build and is faster to call than one of all parameters
+                HR_to_para = _interpolate_on_triangulation(
+                    triangulation[1:], WD_paras[i][selected], interp_type)
+            else:
+                # the gradients of the cubic interpolator are only estimated
+                # once, for all parameters together
+                HR_to_para = _select_value(HR_to_paras, column)
+            results[i] = (grid_para, HR_to_para)
+    return results
+
+
+def _select_HR(color, Mag, WD_para, HR_grid):
+    # the data points that are not NaN and lie inside the HR grid
     with np.errstate(divide='ignore', invalid='ignore'):
         selected = ~np.isnan(color + Mag + WD_para) * \
                    (Mag > HR_grid[3]) * (Mag < HR_grid[4]) * \
                    (color > HR_grid[0]) * (color < HR_grid[1])
+    return selected
 
-    # get the value of z on a H-R diagram grid and the interpolated mapping
-    grid_para = griddata(np.array((color[selected], Mag[selected])).T,
-                         WD_para[selected], (grid_x, grid_y),
-                         method=interp_type,
-                         rescale=True)
-    HR_to_para = interpolate_2d(color[selected], Mag[selected],
-                                WD_para[selected], interp_type)
 
-    # return both the grid data and interpolated mapping
-    return grid_para, HR_to_para
+class _GridMapping:
+    # bilinear interpolation of the values on a regular (x, y) grid, called
+    # like the mappings of _interpolate_on_triangulation. The grid cell of a
+    # point is found by arithmetic, without any search, and points outside
+    # the grid are NaN.
+
+    def __init__(self, grid_x, grid_y, grid_z):
+        self.x0, self.dx = grid_x[0, 0], grid_x[1, 0] - grid_x[0, 0]
+        self.y0, self.dy = grid_y[0, 0], grid_y[0, 1] - grid_y[0, 0]
+        self.grid_z = grid_z
+
+    def __call__(self, *xi):
+        x, y = _split_xi(xi)
+        grid_z = self.grid_z
+        nx, ny = grid_z.shape
+        fx = (np.asarray(x, dtype=float) - self.x0) / self.dx
+        fy = (np.asarray(y, dtype=float) - self.y0) / self.dy
+        fx, fy = np.broadcast_arrays(fx, fy)
+        with np.errstate(invalid='ignore'):
+            inside = (fx >= 0) & (fx < nx - 1) & (fy >= 0) & (fy < ny - 1)
+        ix = np.where(inside, fx, 0).astype(int)
+        iy = np.where(inside, fy, 0).astype(int)
+        a = fx - ix
+        b = fy - iy
+        z = ((1 - a) * (1 - b) * grid_z[ix, iy] +
+             a * (1 - b) * grid_z[ix + 1, iy] +
+             (1 - a) * b * grid_z[ix, iy + 1] + a * b * grid_z[ix + 1, iy + 1])
+        return np.where(inside, z, np.nan)
+
+
+def _interpolate_on_grid(grid_x, grid_y, grid_z):
+    # the bilinear mapping of the values on a regular (x, y) grid
+    return _GridMapping(grid_x, grid_y, grid_z)
+
+
+class _ColumnMapping:
+    # the mapping of one parameter from a mapping of several
+
+    def __init__(self, mapping, column):
+        self.mapping = mapping
+        self.column = column
+
+    def __call__(self, *xi):
+        return self.mapping(*xi)[..., self.column]
+
+
+def _select_value(HR_to_paras, column):
+    # the mapping of one parameter from a mapping of several
+    return _ColumnMapping(HR_to_paras, column)
 
 
 def interp_xy_z(x, y, z, xy_grid, interp_type='linear'):
@@ -1104,13 +1654,11 @@ def interp_xy_z(x, y, z, xy_grid, interp_type='linear'):
     # select only not-NaN data points
     selected = ~np.isnan(x + y + z)
 
-    # get the value of z on a (x,y) grid and the interpolated mapping
-    grid_z = griddata(np.array((x[selected], y[selected])).T,
-                      z[selected], (grid_x, grid_y),
-                      method=interp_type,
-                      rescale=True)
-    xy_to_z = interpolate_2d(x[selected], y[selected], z[selected],
-                             interp_type)
+    # get the value of z on a (x,y) grid and the interpolated mapping, both
+    # from one triangulation of the data points
+    xy_to_z = _interpolate_on_triangulation(
+        _triangulate_2d(x[selected], y[selected]), z[selected], interp_type)
+    grid_z = xy_to_z(grid_x, grid_y)
 
     # return both the grid data and interpolated mapping
     return grid_z, xy_to_z
@@ -1155,6 +1703,251 @@ def interp_xy_z_func(x, y, z, interp_type='linear'):
 #-------------------------------------------------------------------------------
 
 
+if njit is not None:
+
+    @njit(cache=True)
+    def _cool_rate_inv(color, age_cool):
+        # dt / d(color) from the three-point derivative, one pass with scalar
+        # temporaries. Set to 1 at both ends.
+        n = color.size
+        rate_inv = np.empty(n)
+        rate_inv[0] = 1.
+        rate_inv[n - 1] = 1.
+        for i in range(1, n - 1):
+            dc1 = color[i] - color[i - 1]
+            k1 = (age_cool[i] - age_cool[i - 1]) / dc1
+            k2 = (age_cool[i + 1] - age_cool[i]) / (color[i + 1] - color[i])
+            rate_inv[i] = k1 + dc1 * (k1 - k2) / (color[i - 1] - color[i + 1])
+        return rate_inv
+else:
+
+    def _cool_rate_inv(color, age_cool):
+        # dt / d(color) from the three-point derivative, evaluated into the
+        # output array in place. Set to 1 at both ends.
+        rate_inv = np.empty(len(color))
+        rate_inv[0] = rate_inv[-1] = 1.
+        dc1 = color[1:-1] - color[:-2]
+        k1 = (age_cool[1:-1] - age_cool[:-2]) / dc1
+        k2 = (age_cool[2:] - age_cool[1:-1]) / (color[2:] - color[1:-1])
+        k = rate_inv[1:-1]
+        np.subtract(k1, k2, out=k)
+        k *= dc1
+        k /= color[:-2] - color[2:]
+        k += k1
+        return rate_inv
+
+
+@functools.lru_cache(maxsize=4)
+def _logg_func_for(atm_type):
+    # the mapping (logteff, mass) --> logg of the Fontaine2001 tracks, which
+    # gives the logg of the BaSTI models. It only depends on atm_type, so it
+    # is built once for each.
+    mass_array_Fontaine2001, logg_Fontaine2001, _, _, logteff_Fontaine2001, _\
+                = read_cooling_tracks('Fontaine2001',
+                                      'Fontaine2001',
+                                      'Fontaine2001',
+                                      atm_type)
+    return interp_xy_z_func(x=logteff_Fontaine2001,
+                            y=mass_array_Fontaine2001,
+                            z=logg_Fontaine2001)
+
+
+# alias of the model names accepted in each mass region of load_model
+_FONTAINE_ALIASES = {'f': 'Fontaine2001', 'ft': 'Fontaine2001_thin'}
+_BASTI_ALIASES = {'b': 'BaSTI', 'bn': 'BaSTI_nosep'}
+_LOW_MASS_ALIASES = dict(_FONTAINE_ALIASES)
+_MIDDLE_MASS_ALIASES = dict(_FONTAINE_ALIASES,
+                            r001='Renedo2010_001',
+                            r0001='Renedo2010_0001',
+                            c='Camisassa2017',
+                            **_BASTI_ALIASES)
+_HIGH_MASS_ALIASES = dict(_FONTAINE_ALIASES, m='MESA', o='ONe',
+                          **_BASTI_ALIASES)
+_MODEL_NAMES = frozenset([
+    '',
+    'Fontaine2001',
+    'Fontaine2001_thin',
+    'Renedo2010_001',
+    'Renedo2010_0001',
+    'Camisassa2017',
+    'BaSTI',
+    'BaSTI_nosep',
+    'MESA',
+    'ONe',
+])
+
+# the keys of the result of load_model
+_MODEL_KEYS = (
+    'grid_logteff_logg_to_BC',
+    'logteff_logg_to_BC',
+    'grid_logteff_logg_to_color',
+    'logteff_logg_to_color',
+    'mass_array',
+    'logg',
+    'logteff',
+    'age',
+    'age_cool',
+    'cool_rate^-1',
+    'Mbol',
+    'Mag',
+    'color',
+    'grid_HR_to_mass',
+    'HR_to_mass',
+    'grid_HR_to_logg',
+    'HR_to_logg',
+    'grid_HR_to_age',
+    'HR_to_age',
+    'grid_HR_to_age_cool',
+    'HR_to_age_cool',
+    'grid_HR_to_logteff',
+    'HR_to_logteff',
+    'grid_HR_to_Mbol',
+    'HR_to_Mbol',
+    'grid_HR_to_cool_rate^-1',
+    'HR_to_cool_rate^-1',
+    'm_agecool_to_color',
+    'm_agecool_to_Mag',
+)
+
+
+def _model_attribute(key):
+    # the attribute name of a key of WDModel
+    return key.replace('^-1', '_inv')
+
+
+class WDModel(collections.abc.Mapping):
+    """The result of load_model
+
+    A read-only mapping of the keys described in load_model to the grids,
+    data points and mappings of a model. The values are stored in slots and
+    can also be read as attributes, e.g. model.HR_to_mass is
+    model['HR_to_mass']. In the attribute names, the '^-1' of a key becomes
+    '_inv', e.g. model.cool_rate_inv is model['cool_rate^-1']. The keys of a
+    model cannot be changed, model.copy() returns a dictionary that can be.
+    The arrays in it can be modified in place.
+
+    """
+    __slots__ = tuple(_model_attribute(key) for key in _MODEL_KEYS)
+
+    def __init__(self, items):
+        for key in _MODEL_KEYS:
+            object.__setattr__(self, _model_attribute(key), items[key])
+
+    def __getitem__(self, key):
+        if key not in _MODEL_KEYS:
+            raise KeyError(key)
+        return getattr(self, _model_attribute(key))
+
+    def __iter__(self):
+        return iter(_MODEL_KEYS)
+
+    def __len__(self):
+        return len(_MODEL_KEYS)
+
+    def __contains__(self, key):
+        return key in _MODEL_KEYS
+
+    def __setattr__(self, name, value):
+        raise AttributeError('WDModel is read-only.')
+
+    def __delattr__(self, name):
+        raise AttributeError('WDModel is read-only.')
+
+    # the write methods of a dict, which load_model returned before
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('WDModel is read-only, use model.copy() for a dict '
+                        'that can be modified.')
+
+    __setitem__ = __delitem__ = _read_only
+    update = pop = popitem = setdefault = clear = _read_only
+
+    def copy(self):
+        # a dictionary of the model that can be modified, as dict.copy
+        return dict(self)
+
+    def __reduce__(self):
+        # copy and pickle through the constructor, as the slots are read-only
+        return WDModel, (dict(self), )
+
+    def __repr__(self):
+        return 'WDModel(' + ', '.join(_MODEL_KEYS) + ')'
+
+
+# number of load_model results that are kept. A model holds tens of MB of
+# grids, set the environment variable WD_MODELS_MODEL_CACHE_SIZE to keep more,
+# or to 0 to keep none
+_MODEL_CACHE_SIZE = _env_int('WD_MODELS_MODEL_CACHE_SIZE', 2)
+
+
+def _memoize_model(func):
+    # keep the results of the last calls, keyed by the bound arguments. Every
+    # call gets its own copies of the arrays, so that a grid masked in place
+    # by one caller does not reach the others or the interp_atm cache. The
+    # mappings are shared. func.cache_clear() drops all the kept results.
+    cache = collections.OrderedDict()
+    signature = inspect.signature(func)
+
+    def copy_of(model):
+        return WDModel({
+            key: value.copy() if isinstance(value, np.ndarray) else value
+            for key, value in model.items()
+        })
+
+    @functools.wraps(func)
+    def memoized(*args, **kwargs):
+        if _MODEL_CACHE_SIZE <= 0:
+            return copy_of(func(*args, **kwargs))
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        key = tuple((name, _hashable(value))
+                    for name, value in arguments.arguments.items())
+        try:
+            model = cache[key]
+        except KeyError:
+            model = cache[key] = func(*args, **kwargs)
+            if len(cache) > _MODEL_CACHE_SIZE:
+                cache.popitem(last=False)
+        except TypeError:
+            # an argument that cannot be hashed, e.g. a custom interpolator
+            return copy_of(func(*args, **kwargs))
+        else:
+            cache.move_to_end(key)
+        return copy_of(model)
+
+    memoized.cache_clear = cache.clear
+    return memoized
+
+
+def _build_HR_maps(atm_type, HR_bands, logteff_logg_grid, interp_type_atm,
+                   regular_grid_atm=False):
+    # make atmosphere grid and mapping: logteff, logg --> bp-rp,  G-Mbol.
+    # Both come from the interp_atm cache, which is shared by load_model and
+    # read_crystallization_fraction.
+    color_maps = interp_atm(atm_type,
+                            HR_bands[0],
+                            logteff_logg_grid=logteff_logg_grid,
+                            interp_type_atm=interp_type_atm,
+                            regular_grid_atm=regular_grid_atm)
+    BC_maps = interp_atm(atm_type,
+                         HR_bands[1] + '-Mbol',
+                         logteff_logg_grid=logteff_logg_grid,
+                         interp_type_atm=interp_type_atm,
+                         regular_grid_atm=regular_grid_atm)
+    return color_maps, BC_maps
+
+
+def _tracks_to_HR(logteff_logg_to_color, logteff_logg_to_BC, logteff, logg,
+                  Mbol):
+    # Get Colour/Magnitude for Evolution Tracks
+    # the BC array returned by the interpolator is new, Mbol is added to it
+    # in place
+    Mag = logteff_logg_to_BC(logteff, logg)
+    Mag += Mbol
+    color = logteff_logg_to_color(logteff, logg)
+    return color, Mag
+
+
+@_memoize_model
 def load_model(low_mass_model,
                middle_mass_model,
                high_mass_model,
@@ -1170,7 +1963,10 @@ def load_model(low_mass_model,
                ms_interpolator=None,
                ifmr_model='Cummings18',
                ifmr_fill_value=0.,
-               ifmr_mass=None):
+               ifmr_mass=None,
+               regular_grid_atm=False,
+               regular_grid_HR=False,
+               track_dtype=np.float64):
     """ Load a set of cooling tracks and interpolate the HR diagram mapping
 
     This function reads a set of cooling tracks assigned by the user and returns
@@ -1271,11 +2067,27 @@ def load_model(low_mass_model,
             (See the IFMR function)
         ifmr_mass: numeric (Default: None)
             (See the IFMR function)
+        regular_grid_atm:   Bool. *Optional*
+            (See the interp_atm function)
+        regular_grid_HR:    Bool. *Optional*
+            If true, the HR --> WD parameter mappings interpolate their grid
+            values (See the regular_grid argument of interp_HR_to_para).
+        track_dtype:        Numpy dtype. *Optional*
+            The dtype of the returned cooling-track data points. E.g.,
+            np.float32 halves their memory, which is precise enough for most
+            uses. All grids and mappings are computed in float64 before the
+            data points are cast.
 
     Returns:
-        A Dictionary.
+        A WDModel, a read-only dictionary whose values can also be read as
+        attributes (See the WDModel class).
         It contains the atmosphere grids and mapping, cooling-track data points,
         and parameter mappings based on the cooling tracks. 
+        The results of the last two calls are kept and returned again, with
+        new copies of the arrays, for the same arguments. Set the environment
+        variable WD_MODELS_MODEL_CACHE_SIZE to keep more results or 0 to keep
+        none, and call load_model.cache_clear() to drop them. Use model.copy() or
+        dict(model) for a dictionary that can be modified.
         The keys of this dictionary are:
             interpolation results:
         ========================================================================
@@ -1323,80 +2135,27 @@ def load_model(low_mass_model,
 
     """
     # define some alias of model names
-    if low_mass_model == 'f':
-        low_mass_model = 'Fontaine2001'
-    if low_mass_model == 'ft':
-        low_mass_model = 'Fontaine2001_thin'
-
-    if middle_mass_model == 'r001':
-        middle_mass_model = 'Renedo2010_001'
-    if middle_mass_model == 'r0001':
-        middle_mass_model = 'Renedo2010_0001'
-    if middle_mass_model == 'f':
-        middle_mass_model = 'Fontaine2001'
-    if middle_mass_model == 'ft':
-        middle_mass_model = 'Fontaine2001_thin'
-    if middle_mass_model == 'c':
-        middle_mass_model = 'Camisassa2017'
-    if middle_mass_model == 'b':
-        middle_mass_model = 'BaSTI'
-    if middle_mass_model == 'bn':
-        middle_mass_model = 'BaSTI_nosep'
-
-    if high_mass_model == 'f':
-        high_mass_model = 'Fontaine2001'
-    if high_mass_model == 'ft':
-        high_mass_model = 'Fontaine2001_thin'
-    if high_mass_model == 'b':
-        high_mass_model = 'BaSTI'
-    if high_mass_model == 'bn':
-        high_mass_model = 'BaSTI_nosep'
-    if high_mass_model == 'm':
-        high_mass_model = 'MESA'
-    if high_mass_model == 'o':
-        high_mass_model = 'ONe'
-
-    model_names = [
-        '',
-        'Fontaine2001',
-        'Fontaine2001_thin',
-        'Renedo2010_001',
-        'Renedo2010_0001',
-        'Camisassa2017',
-        'BaSTI',
-        'BaSTI_nosep',
-        'MESA',
-        'ONe',
-    ]
-    if (low_mass_model not in model_names
-            or middle_mass_model not in model_names
-            or high_mass_model not in model_names):
+    low_mass_model = _LOW_MASS_ALIASES.get(low_mass_model, low_mass_model)
+    middle_mass_model = _MIDDLE_MASS_ALIASES.get(middle_mass_model,
+                                                 middle_mass_model)
+    high_mass_model = _HIGH_MASS_ALIASES.get(high_mass_model, high_mass_model)
+
+    if (low_mass_model not in _MODEL_NAMES
+            or middle_mass_model not in _MODEL_NAMES
+            or high_mass_model not in _MODEL_NAMES):
         print('please check the model names.')
     if atm_type not in ['H', 'He']:
         print('please enter either \'H\' or \'He\' for atm_type.')
 
     # make atmosphere grid and mapping: logteff, logg --> bp-rp,  G-Mbol
-    grid_logteff_logg_to_color, logteff_logg_to_color = interp_atm(
-        atm_type,
-        HR_bands[0],
-        logteff_logg_grid=logteff_logg_grid,
-        interp_type_atm=interp_type_atm)
-    grid_logteff_logg_to_BC, logteff_logg_to_BC = interp_atm(
-        atm_type,
-        HR_bands[1] + '-Mbol',
-        logteff_logg_grid=logteff_logg_grid,
-        interp_type_atm=interp_type_atm)
+    ((grid_logteff_logg_to_color, logteff_logg_to_color),
+     (grid_logteff_logg_to_BC, logteff_logg_to_BC)) = _build_HR_maps(
+         atm_type, HR_bands, logteff_logg_grid, interp_type_atm,
+         regular_grid_atm)
 
     # get for logg_func BaSTI models
     if 'BaSTI' in middle_mass_model or 'BaSTI' in high_mass_model:
-        mass_array_Fontaine2001, logg_Fontaine2001, _, _, logteff_Fontaine2001, _\
-                    = read_cooling_tracks('Fontaine2001',
-                                          'Fontaine2001',
-                                          'Fontaine2001',
-                                          atm_type)
-        logg_func = interp_xy_z_func(x=logteff_Fontaine2001,
-                                     y=mass_array_Fontaine2001,
-                                     z=logg_Fontaine2001)
+        logg_func = _logg_func_for(atm_type)
     else:
         logg_func = None
 
@@ -1410,38 +2169,45 @@ def load_model(low_mass_model,
                         ifmr_model, ifmr_fill_value, ifmr_mass)
 
     # Get Colour/Magnitude for Evolution Tracks
-    Mag = logteff_logg_to_BC(logteff, logg) + Mbol
-    color = logteff_logg_to_color(logteff, logg)
+    color, Mag = _tracks_to_HR(logteff_logg_to_color, logteff_logg_to_BC,
+                               logteff, logg, Mbol)
 
-    # Calculate the Recipical of Cooling Rate (Cooling Time per BP-RP)
-    k1 = (age_cool[1:-1] - age_cool[:-2]) / (color[1:-1] - color[:-2])
-    k2 = (age_cool[2:] - age_cool[1:-1]) / (color[2:] - color[1:-1])
-    k = k1 + (color[1:-1] - color[:-2]) * (k1 - k2) / (color[:-2] - color[2:])
-    rate_inv = np.concatenate((np.array([1]), k, np.array([1])))
+    # the interpolators and the numba kernels work on C-contiguous float64
+    # arrays, make sure they get them without a copy of their own. These are
+    # no-ops for arrays that already are.
+    mass_array, logg, age, age_cool, logteff, Mbol, Mag, color = (
+        np.ascontiguousarray(column, dtype=np.float64)
+        for column in (mass_array, logg, age, age_cool, logteff, Mbol, Mag,
+                       color))
 
-    # Get Parameters on HR Diagram
-    grid_HR_to_mass, HR_to_mass = interp_HR_to_para(color, Mag, mass_array,
-                                                    HR_grid, interp_type)
-    grid_HR_to_logg, HR_to_logg = interp_HR_to_para(color, Mag, logg, HR_grid,
-                                                    interp_type)
-    grid_HR_to_age, HR_to_age = interp_HR_to_para(color, Mag, age, HR_grid,
-                                                  interp_type)
-    grid_HR_to_age_cool, HR_to_age_cool = interp_HR_to_para(
-        color, Mag, age_cool, HR_grid, interp_type)
-    grid_HR_to_logteff, HR_to_logteff = interp_HR_to_para(
-        color, Mag, logteff, HR_grid, interp_type)
-    grid_HR_to_Mbol, HR_to_Mbol = interp_HR_to_para(color, Mag, Mbol, HR_grid,
-                                                    interp_type)
-    grid_HR_to_rate_inv, HR_to_rate_inv = interp_HR_to_para(
-        color, Mag, rate_inv, HR_grid, interp_type)
+    # Calculate the Recipical of Cooling Rate (Cooling Time per BP-RP)
+    rate_inv = _cool_rate_inv(color, age_cool)
+
+    # Get Parameters on HR Diagram, the data points are only triangulated and
+    # located on the grid once for all parameters
+    ((grid_HR_to_mass, HR_to_mass), (grid_HR_to_logg, HR_to_logg),
+     (grid_HR_to_age, HR_to_age), (grid_HR_to_age_cool, HR_to_age_cool),
+     (grid_HR_to_logteff, HR_to_logteff), (grid_HR_to_Mbol, HR_to_Mbol),
+     (grid_HR_to_rate_inv, HR_to_rate_inv)) = interp_HR_to_paras(
+         color, Mag,
+         [mass_array, logg, age, age_cool, logteff, Mbol, rate_inv], HR_grid,
+         interp_type,
+         regular_grid=regular_grid_HR)
     # (mass, t_cool) --> bp-rp, G
     m_agecool_to_color = interp_xy_z_func(mass_array, age_cool, color,
                                           interp_type)
     m_agecool_to_Mag = interp_xy_z_func(mass_array, age_cool, Mag, interp_type)
 
+    # the cooling track data points are only cast after all the
+    # interpolations, which are computed from float64
+    mass_array, logg, logteff, age, age_cool, rate_inv, Mbol, Mag, color = (
+        np.asarray(column).astype(track_dtype, copy=False)
+        for column in (mass_array, logg, logteff, age, age_cool, rate_inv,
+                       Mbol, Mag, color))
+
     # Return a dictionary containing all the cooling track data points,
     # interpolation functions and interpolation grids
-    return {
+    return WDModel({
         'grid_logteff_logg_to_BC': grid_logteff_logg_to_BC,
         'logteff_logg_to_BC': logteff_logg_to_BC,
         'grid_logteff_logg_to_color': grid_logteff_logg_to_color,
@@ -1471,7 +2237,29 @@ def load_model(low_mass_model,
         'HR_to_cool_rate^-1': HR_to_rate_inv,
         'm_agecool_to_color': m_agecool_to_color,
         'm_agecool_to_Mag': m_agecool_to_Mag
-    }
+    })
+
+
+@functools.lru_cache(maxsize=_COOL_TABLE_CACHE_SIZE)
+def _read_crystallization_track(path):
+    # read the logg, logteff, Mbol and crystallized fraction X of a Fontaine
+    # et al. 2001 C_*0204 track. The files are ASCII and are parsed as bytes,
+    # without decoding.
+    with open(path, 'rb') as f:
+        text = f.read()
+    # the models start after the '=' line that closes the header, the
+    # records are viewed from there without copying the buffer
+    header_end = text.rfind(b'=\n')
+    offset = header_end + 2 if header_end >= 0 else 0
+    # each column is converted at once as in _read_fontaine_track
+    records = np.frombuffer(text,
+                            dtype=_FONTAINE_X_RECORD,
+                            count=(len(text) - offset) //
+                            _FONTAINE_RECORD_LEN,
+                            offset=offset)
+    logteff, Mbol = _fontaine_logteff_Mbol(records)
+    return (records['logg'].astype(float), logteff, Mbol,
+            records['X'].astype(float))
 
 
 def read_crystallization_fraction(HR_bands=('bp-rp', 'G'),
@@ -1483,60 +2271,26 @@ def read_crystallization_fraction(HR_bands=('bp-rp', 'G'),
                                   for_comparison=False):
 
     atm_type = 'H'
-    # make atmosphere grid and mapping: logteff, logg --> bp-rp,  G-Mbol
-    grid_logteff_logg_to_color, logteff_logg_to_color = interp_atm(
-        atm_type,
-        HR_bands[0],
-        logteff_logg_grid=logteff_logg_grid,
-        interp_type_atm=interp_type_atm)
-    grid_logteff_logg_to_BC, logteff_logg_to_BC = interp_atm(
-        atm_type,
-        HR_bands[1] + '-Mbol',
-        logteff_logg_grid=logteff_logg_grid,
-        interp_type_atm=interp_type_atm)
-
-    logg = np.zeros(0)
-    logteff = np.zeros(0)
-    Mbol = np.zeros(0)
-    X = np.zeros(0)
-    for mass in [
+    # make atmosphere mapping: logteff, logg --> bp-rp,  G-Mbol
+    (_, logteff_logg_to_color), (_, logteff_logg_to_BC) = _build_HR_maps(
+        atm_type, HR_bands, logteff_logg_grid, interp_type_atm)
+
+    # the tracks are independent and read concurrently, their columns are
+    # joined once after all tracks are read
+    #f       = open('models/Fontaine_AllSequences/CO_' + mass + '0204')
+    tracks = _read_in_threads(_read_crystallization_track, [
+        dirpath + '/cooling_models/Fontaine_AllSequences/C_' + mass + '0204'
+        for mass in [
             '020', '030', '040', '050', '060', '070', '080', '090', '095',
             '100', '105', '110', '115', '120', '125', '130'
-    ]:
-        #f       = open('models/Fontaine_AllSequences/CO_' + mass + '0204')
-        f = open(dirpath + '/cooling_models/Fontaine_AllSequences/C_' + mass +
-                 '0204')
-        text = f.read()
-        example = ('      1    57674.0025    8.36722799  7.160654E+08 '
-                   ' 4.000000E+05  4.042436E+33\n'
-                   '        7.959696E+00  2.425570E+01  7.231926E+00 '
-                   ' 0.0000000000  0.000000E+00\n'
-                   '        6.019629E+34 -4.010597E+00 -1.991404E+00 '
-                   '-3.055254E-01 -3.055254E-01')
-        logg_temp = []
-        logteff_temp = []
-        Mbol_temp = []
-        X_temp = []
-        l_line = len(example)
-        #for line in range(len(text)//l_line):
-        for line in range(len(text) // l_line):
-            logteff_temp.append(
-                np.log10(float(text[line * l_line + 9:line * l_line + 21])))
-            logg_temp.append(float(text[line * l_line + 22:line * l_line +
-                                        35]))
-            Mbol_temp.append(4.75 - 2.5 * np.log10(
-                float(text[line * l_line + 64:line * l_line + 76]) / 3.828e33))
-            X_temp.append(
-                float(text[line * l_line + 79 + 48:line * l_line + 79 + 60]))
-        logg = np.concatenate((logg, logg_temp))
-        logteff = np.concatenate((logteff, logteff_temp))
-        Mbol = np.concatenate((Mbol, Mbol_temp))
-        X = np.concatenate((X, X_temp))
-        f.close()
+        ]
+    ])
+    logg, logteff, Mbol, X = (np.concatenate(columns)
+                              for columns in zip(*tracks))
 
     # Get Colour/Magnitude for Evolution Tracks
-    Mag = logteff_logg_to_BC(logteff, logg) + Mbol
-    color = logteff_logg_to_color(logteff, logg)
+    color, Mag = _tracks_to_HR(logteff_logg_to_color, logteff_logg_to_BC,
+                               logteff, logg, Mbol)
 
     # Get Parameters on HR Diagram
     grid_HR_to_X, HR_to_X = interp_HR_to_para(color, Mag, X, HR_grid,